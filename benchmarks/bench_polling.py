@@ -0,0 +1,317 @@
+"""Offline benchmark of GeckoTerminal setup, polling and notification paths.
+
+Loads the integration into a real Home Assistant instance, sets up watchlist
+config entries against a local fake API and reports, per pool count:
+
+- requests sent and 429 responses received,
+- wall-clock time of the entry setup including the first fetch,
+- wall-clock and CPU time of one full refresh of every pool,
+- state writes (state_changed events) per refresh cycle,
+- memory allocated per pool by the entry setup (data source, history,
+  sensors and their registry entries).
+
+A row whose pools are not all refreshed within the retry budget is reported
+as FAILED and makes the benchmark exit with status 1.
+
+Usage (from the repository root, with Home Assistant installed):
+
+    python benchmarks/bench_polling.py --pools 1 10 100 1000 --latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant import bootstrap, config_entries, loader  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.geckoterminal import (  # noqa: E402
+    CONF_NAME,
+    CONF_NETWORK,
+    CONF_POOL_ADDRESS,
+    CONF_POOLS,
+    CONF_UPDATE_INTERVAL,
+    CONF_WARMUP_WINDOW,
+    DATA_CLIENT,
+    DATA_ENTRY_MANAGERS,
+    DATA_SCHEDULER,
+    DOMAIN,
+)
+from custom_components.geckoterminal.api import GeckoTerminalApiClient  # noqa: E402
+from custom_components.geckoterminal.config_flow import DEFAULT_OPTIONS  # noqa: E402
+from custom_components.geckoterminal.coordinator import async_get_coordinator  # noqa: E402
+from custom_components.geckoterminal.scheduler import GeckoTerminalRequestScheduler  # noqa: E402
+from fake_server import FakeGeckoTerminal  # noqa: E402
+
+# Ile razy ponawiać odświeżenie pul, które dostały 429, zanim cykl się podda
+MAX_ATTEMPTS = 20
+
+
+class RefreshFailed(Exception):
+    """Raised when some pools are still not refreshed after MAX_ATTEMPTS."""
+
+
+def _pool_address(index):
+    """Return a deterministic fake pool address."""
+    return f"0x{index:040x}"
+
+
+async def _async_create_hass(config_dir):
+    """Create a Home Assistant instance that can load the custom integration."""
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        # Starsze wersje Home Assistant nie przyjmują katalogu konfiguracji
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    # Integracja jest ładowana z katalogu custom_components w katalogu konfiguracji
+    (Path(config_dir) / "custom_components").symlink_to(
+        Path(__file__).resolve().parent.parent / "custom_components"
+    )
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    await bootstrap.load_registries(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+    return hass
+
+
+def _watchlist_entries(pools, pools_per_entry, update_interval):
+    """Return watchlist config entries tracking the given pools."""
+    entries = []
+    for index in range(0, len(pools), pools_per_entry):
+        name = f"Benchmark {index // pools_per_entry + 1}"
+        data = {
+            **DEFAULT_OPTIONS,
+            CONF_NAME: name,
+            CONF_POOLS: [
+                {CONF_NAME: address, CONF_NETWORK: network, CONF_POOL_ADDRESS: address}
+                for network, address in pools[index:index + pools_per_entry]
+            ],
+            CONF_UPDATE_INTERVAL: update_interval,
+            # Bez okna rozgrzewki pierwsze dane są pobierane w trakcie konfiguracji wpisu
+            CONF_WARMUP_WINDOW: 0,
+        }
+        entries.append(config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=name,
+            data=data,
+            source=config_entries.SOURCE_USER,
+            options={},
+        ))
+    return entries
+
+
+def _data_sources(hass):
+    """Return the data sources of every pool tracked by the loaded entries."""
+    return [
+        tracked.data_source
+        for manager in hass.data[DOMAIN].get(DATA_ENTRY_MANAGERS, {}).values()
+        for tracked in manager.tracked_pools
+    ]
+
+
+async def async_run(pool_count, args, server):
+    """Set up pool_count pools, run the refresh cycles and return the results."""
+    server.reset_counters()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_create_hass(config_dir)
+        # Klient korzystający z lokalnego serwera zamiast publicznego API
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        scheduler = GeckoTerminalRequestScheduler(args.calls_per_minute, args.burst)
+        domain_data[DATA_SCHEDULER] = scheduler
+        client = GeckoTerminalApiClient(hass, scheduler, base_url=server.base_url)
+        domain_data[DATA_CLIENT] = client
+
+        networks = [f"net{index}" for index in range(args.networks)]
+        pools = [
+            (networks[index % len(networks)], _pool_address(index)) for index in range(pool_count)
+        ]
+        entries = _watchlist_entries(pools, args.pools_per_entry, args.update_interval)
+
+        state_writes = 0
+
+        def _count_state_write(event):
+            nonlocal state_writes
+            state_writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+
+        result = {"pools": pool_count, "status": "ok"}
+        # Pamięć: wpisy, źródła danych, sensory i pierwsze dane
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        setup_started = time.perf_counter()
+        try:
+            for entry in entries:
+                await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+            sources = _data_sources(hass)
+            if len(sources) != pool_count:
+                raise RefreshFailed(f"{len(sources)} of {pool_count} pools set up")
+            # Pule odroczone przez 429 w trakcie konfiguracji są pobierane ponownie
+            await _async_refresh_all(hass, sources, None)
+            setup_time = time.perf_counter() - setup_started
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+            wall_times = []
+            cpu_times = []
+            writes = []
+            for _ in range(args.cycles):
+                writes_before = state_writes
+                wall_started = time.perf_counter()
+                cpu_started = time.process_time()
+                await _async_refresh_all(hass, sources, dt_util.utcnow())
+                await hass.async_block_till_done()
+                cpu_times.append(time.process_time() - cpu_started)
+                wall_times.append(time.perf_counter() - wall_started)
+                writes.append(state_writes - writes_before)
+        except RefreshFailed as e:
+            tracemalloc.stop()
+            result.update(status="FAILED", error=str(e))
+        else:
+            # Serwer testowy działa w tym samym procesie - jego alokacje pomijamy
+            server_filters = [
+                tracemalloc.Filter(False, "*fake_server.py"),
+                tracemalloc.Filter(False, "*aiohttp/web*"),
+            ]
+            allocated = sum(
+                stat.size_diff
+                for stat in after.filter_traces(server_filters).compare_to(
+                    baseline.filter_traces(server_filters), "filename"
+                )
+            )
+            result.update(
+                setup_s=setup_time,
+                refresh_s=statistics.median(wall_times) if wall_times else 0.0,
+                cpu_ms=statistics.median(cpu_times) * 1000 if cpu_times else 0.0,
+                state_writes=statistics.median(writes) if writes else 0,
+                memory_kib_per_pool=allocated / pool_count / 1024,
+            )
+        result.update(
+            requests=server.requests,
+            rate_limited=server.rate_limited,
+            p95_latency_ms=client.stats.total.latency(0.95),
+        )
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    return result
+
+
+async def _async_refresh_all(hass, sources, cycle_started):
+    """Refresh every pool once, retrying pools deferred by a 429.
+
+    With cycle_started None only pools that were never fetched are refreshed.
+    Raises RefreshFailed when some pools are still not refreshed after
+    MAX_ATTEMPTS rounds.
+    """
+    missing = {}
+    for attempt in range(MAX_ATTEMPTS):
+        # Źródło danych zapisuje czas każdego pobrania, także niezmienionych danych
+        missing = {}
+        for data_source in sources:
+            fetched_at = data_source.fetched_at
+            if fetched_at is None or (cycle_started is not None and fetched_at < cycle_started):
+                missing.setdefault(data_source.network, []).append(data_source.pool_address)
+        if not missing:
+            return
+        if attempt:
+            pause = hass.data[DOMAIN][DATA_SCHEDULER].paused_for
+            if pause:
+                await asyncio.sleep(pause)
+        await asyncio.gather(*(
+            async_get_coordinator(hass, network).async_refresh_pools(addresses)
+            for network, addresses in missing.items()
+        ))
+
+    still_missing = sum(
+        1 for data_source in sources
+        if data_source.fetched_at is None
+        or (cycle_started is not None and data_source.fetched_at < cycle_started)
+    )
+    if still_missing:
+        raise RefreshFailed(f"{still_missing} pools not refreshed after {MAX_ATTEMPTS} attempts")
+
+
+def _print_results(results):
+    """Print the results as a table; failed rows show their error instead."""
+    columns = (
+        ("pools", "{:>6}"),
+        ("requests", "{:>9}"),
+        ("rate_limited", "{:>6}"),
+        ("setup_s", "{:>9.3f}"),
+        ("refresh_s", "{:>10.3f}"),
+        ("cpu_ms", "{:>9.2f}"),
+        ("state_writes", "{:>7g}"),
+        ("memory_kib_per_pool", "{:>10.1f}"),
+        ("p95_latency_ms", "{:>8}"),
+    )
+    headers = ("pools", "requests", "429", "setup s", "refresh s", "cpu ms", "writes", "KiB/pool", "p95 ms")
+    widths = (6, 9, 6, 9, 10, 9, 7, 10, 8)
+    print(" ".join(f"{header:>{width}}" for header, width in zip(headers, widths)))
+    for result in results:
+        if result["status"] != "ok":
+            print(f"{result['pools']:>6} {result['requests']:>9} {result['rate_limited']:>6} "
+                  f"FAILED: {result['error']}")
+            continue
+        print(" ".join(fmt.format(result[key]) for key, fmt in columns))
+
+
+async def async_main(args):
+    """Run the benchmark for every requested pool count; return False if a row failed."""
+    server = FakeGeckoTerminal(args.latency, args.rate_limit_every, args.retry_after)
+    await server.async_start()
+    try:
+        results = [await async_run(pool_count, args, server) for pool_count in args.pools]
+    finally:
+        await server.async_stop()
+    _print_results(results)
+    return all(result["status"] == "ok" for result in results)
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pools", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="pool counts to benchmark (1-1000)")
+    parser.add_argument("--networks", type=int, default=1, help="number of networks the pools are spread over")
+    parser.add_argument("--pools-per-entry", type=int, default=50,
+                        help="pools per watchlist config entry")
+    parser.add_argument("--latency", type=float, default=0.0, help="added response latency in seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="answer every n-th request with HTTP 429 (0 = never)")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After of injected 429 responses")
+    parser.add_argument("--cycles", type=int, default=5, help="refresh cycles per pool count")
+    parser.add_argument("--update-interval", type=int, default=30, help="update interval of the data sources")
+    parser.add_argument("--calls-per-minute", type=float, default=60_000,
+                        help="request budget of the scheduler (default: effectively unlimited)")
+    parser.add_argument("--burst", type=int, default=1000, help="burst size of the scheduler")
+    parser.add_argument("--verbose", action="store_true", help="show the integration's log output")
+    args = parser.parse_args()
+
+    if any(not 1 <= count <= 1000 for count in args.pools):
+        parser.error("pool counts must be between 1 and 1000")
+    if args.pools_per_entry < 1:
+        parser.error("--pools-per-entry must be at least 1")
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+    sys.exit(0 if asyncio.run(async_main(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
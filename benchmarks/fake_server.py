@@ -0,0 +1,123 @@
+"""Local stand-in for the GeckoTerminal API used by the benchmarks."""
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+
+class FakeGeckoTerminal:
+    """Serve deterministic pool payloads with configurable latency and 429s.
+
+    latency is added to every response (seconds), rate_limit_every makes
+    every n-th request fail with HTTP 429 (0 disables it) and retry_after
+    is the Retry-After value sent with those responses.
+    """
+
+    def __init__(self, latency=0.0, rate_limit_every=0, retry_after=1, seed=0):
+        """Initialize the server."""
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._prices = {}
+        self._runner = None
+        self.base_url = None
+
+    async def async_start(self, host="127.0.0.1", port=0):
+        """Start listening; port 0 picks a free port."""
+        app = web.Application()
+        app.router.add_get("/networks/{network}/pools/multi/{addresses}", self._handle_multi)
+        app.router.add_get("/networks/{network}/pools/{address}", self._handle_pool)
+        app.router.add_get(
+            "/simple/networks/{network}/token_price/{addresses}", self._handle_token_price
+        )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}"
+
+    async def async_stop(self):
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counters(self):
+        """Reset the request counters between benchmark runs."""
+        self.requests = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+
+    def _price(self, key):
+        """Return the next price of a random walk per pool or token."""
+        price = self._prices.get(key, 1.0 + self._random.random() * 100)
+        price *= 1 + self._random.gauss(0, 0.002)
+        self._prices[key] = price
+        return price
+
+    def _pool(self, network, address):
+        """Return a pool object shaped like the API's."""
+        price = self._price(address.lower())
+        return {
+            "id": f"{network}_{address}",
+            "type": "pool",
+            "attributes": {
+                "name": f"TKN{address[-4:]} / USDC",
+                "address": address,
+                "base_token_price_usd": f"{price:.10f}",
+                "quote_token_price_usd": "1.0",
+                "base_token_symbol": f"TKN{address[-4:]}",
+                "quote_token_symbol": "USDC",
+                "fdv_usd": f"{price * 1e7:.2f}",
+                "market_cap_usd": f"{price * 5e6:.2f}",
+                "reserve_in_usd": f"{price * 1e5:.2f}",
+                "price_change_percentage": {
+                    window: f"{self._random.gauss(0, 1):.2f}" for window in ("m5", "h1", "h6", "h24")
+                },
+                "volume_usd": {
+                    window: f"{self._random.random() * 1e5:.2f}" for window in ("m5", "h1", "h6", "h24")
+                },
+                "transactions": {
+                    window: {"buys": self._random.randint(0, 500), "sells": self._random.randint(0, 500)}
+                    for window in ("m5", "h1", "h6", "h24")
+                },
+            },
+            "relationships": {
+                "base_token": {"data": {"id": f"{network}_0xtoken{address[-8:]}", "type": "token"}},
+            },
+        }
+
+    async def _respond(self, payload):
+        """Apply latency and 429 injection, then return the JSON payload."""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            return web.Response(status=429, headers={"Retry-After": str(self.retry_after)})
+        body = json.dumps(payload)
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    async def _handle_multi(self, request):
+        """Handle /networks/{network}/pools/multi/{addresses}."""
+        network = request.match_info["network"]
+        addresses = request.match_info["addresses"].split(",")
+        return await self._respond({"data": [self._pool(network, address) for address in addresses]})
+
+    async def _handle_pool(self, request):
+        """Handle /networks/{network}/pools/{address}."""
+        network = request.match_info["network"]
+        return await self._respond({"data": self._pool(network, request.match_info["address"])})
+
+    async def _handle_token_price(self, request):
+        """Handle /simple/networks/{network}/token_price/{addresses}."""
+        addresses = request.match_info["addresses"].split(",")
+        prices = {address: f"{self._price(address.lower()):.10f}" for address in addresses}
+        return await self._respond({"data": {"attributes": {"token_prices": prices}}})
@@ -15,14 +15,81 @@ CONF_SHOW_VOLUME = "show_volume"
 CONF_DECIMAL_PLACES = "decimal_places"
 CONF_SHOW_FDV = "show_fdv"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_WARMUP_WINDOW = "warmup_window"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_SHOW_STATISTICS = "show_statistics"
+CONF_HISTORY_BACKFILL = "history_backfill"
+CONF_EXTRA_METRICS = "extra_metrics"
+CONF_PRICE_SOURCE = "price_source"
+# Reguły alertów cenowych, jedna w linii (np. "above 1.25", "change 5 5m")
+CONF_ALERT_RULES = "alert_rules"
+# Posiadane ilości tokenu bazowego, jedna pula w linii (np. "eth/0x... 1.5")
+CONF_HOLDINGS = "holdings"
+# Lista pul wpisu typu "lista obserwowanych" (wiele pul, także z różnych sieci)
+CONF_POOLS = "pools"
+# Adres przekaźnika strumieniowego (ws://, wss://, http://, https://); pusty - tylko odpytywanie
+CONF_STREAM_URL = "stream_url"
+
+# Źródło ceny: endpoint puli albo wspólna cena tokenu bazowego
+PRICE_SOURCE_POOL = "pool"
+PRICE_SOURCE_TOKEN = "token"
 
 # Domyślne wartości
 DEFAULT_UPDATE_INTERVAL = 30  # sekundy
+# Okno rozgrzewki po starcie; 0 oznacza pobranie danych przed dodaniem encji
+DEFAULT_WARMUP_WINDOW = 30  # sekundy
+# Górna granica odstępu odpytywania spokojnych pul w trybie adaptacyjnym
+DEFAULT_MAX_UPDATE_INTERVAL = 300  # sekundy
+
+API_BASE_URL = "https://api.geckoterminal.com/api/v2"
+
+# Endpoint /pools/multi przyjmuje maksymalnie 30 adresów w jednym zapytaniu
+MULTI_POOL_CHUNK_SIZE = 30
+
+# Publiczne API GeckoTerminal pozwala na ok. 30 zapytań na minutę
+API_CALLS_PER_MINUTE = 30
+API_BURST = 3
+
+# Klucze współdzielonych obiektów w hass.data[DOMAIN]
+DATA_COORDINATORS = "coordinators"
+DATA_CLIENT = "client"
+DATA_SCHEDULER = "scheduler"
+DATA_POOL_CACHE = "pool_cache"
+DATA_OHLCV_STORE = "ohlcv_store"
+DATA_ENTRY_MANAGERS = "entry_managers"
+DATA_STREAMS = "streams"
+DATA_PORTFOLIO = "portfolio"
+# ID wpisu, który obecnie udostępnia wspólne sensory API i portfela
+DATA_SHARED_SENSORS_OWNER = "shared_sensors_owner"
 
 PLATFORMS = [Platform.SENSOR]
 
 _LOGGER = logging.getLogger(__name__)
 
+def entry_pools(entry: ConfigEntry):
+    """Return the pools tracked by an entry: its watchlist or its single pool."""
+    config = {**entry.data, **entry.options}
+    if CONF_POOLS in config:
+        return list(config[CONF_POOLS])
+    return [{
+        CONF_NAME: config[CONF_NAME],
+        CONF_NETWORK: config[CONF_NETWORK],
+        CONF_POOL_ADDRESS: config[CONF_POOL_ADDRESS],
+    }]
+
+def configured_pools(hass: HomeAssistant, exclude_entry_id=None):
+    """Return {(network, address lower case)} of the pools tracked by the entries.
+    
+    Pools of the entry exclude_entry_id are left out.
+    """
+    return {
+        (pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS].lower())
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id != exclude_entry_id
+        for pool in entry_pools(entry)
+    }
+
 async def async_setup(hass: HomeAssistant, config):
     """Set up the GeckoTerminal component."""
     hass.data.setdefault(DOMAIN, {})
@@ -30,17 +97,17 @@ async def async_setup(hass: HomeAssistant, config):
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up GeckoTerminal from a config entry."""
-    _LOGGER.debug(f"Setting up GeckoTerminal entry. Data: {entry.data}, Options: {entry.options}")
+    _LOGGER.debug("Setting up GeckoTerminal entry. Data: %s, Options: %s", entry.data, entry.options)
     
     hass.data.setdefault(DOMAIN, {})
     
     # Zapisz dane i opcje
     if entry.options:
         config = {**entry.data, **entry.options}
-        _LOGGER.debug(f"Łączę dane i opcje: {config}")
+        _LOGGER.debug("Łączę dane i opcje: %s", config)
     else:
         config = entry.data
-        _LOGGER.debug(f"Używam tylko danych bez opcji: {config}")
+        _LOGGER.debug("Używam tylko danych bez opcji: %s", config)
     
     hass.data[DOMAIN][entry.entry_id] = config
     
@@ -54,18 +121,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options update."""
-    _LOGGER.debug(f"Aktualizacja opcji GeckoTerminal. Dane: {entry.data}, Opcje: {entry.options}")
+    _LOGGER.debug("Aktualizacja opcji GeckoTerminal. Dane: %s, Opcje: %s", entry.data, entry.options)
     
     # Zaktualizuj dane w hass.data
     if entry.options:
         config = {**entry.data, **entry.options}
-        _LOGGER.debug(f"Łączę dane i opcje po aktualizacji: {config}")
+        _LOGGER.debug("Łączę dane i opcje po aktualizacji: %s", config)
     else:
         config = entry.data
-        _LOGGER.debug(f"Używam tylko danych bez opcji po aktualizacji: {config}")
+        _LOGGER.debug("Używam tylko danych bez opcji po aktualizacji: %s", config)
     
     hass.data[DOMAIN][entry.entry_id] = config
     
+    # Opcje są stosowane do działających encji i źródeł danych bez
+    # przeładowania; od nowa budowane są tylko pule o zmienionej sieci lub adresie
+    manager = hass.data[DOMAIN].get(DATA_ENTRY_MANAGERS, {}).get(entry.entry_id)
+    if manager is not None:
+        await manager.async_update_config(config, entry_pools(entry))
+        return
+    
     # Przeładuj integrację
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -76,4 +150,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Forget cached data of a removed entry."""
+    from .cache import async_get_pool_cache
+    from .ohlcv import async_get_ohlcv_store
+
+    cache = await async_get_pool_cache(hass)
+    ohlcv_store = await async_get_ohlcv_store(hass)
+    # Dane puli śledzonej także przez inny wpis są nadal potrzebne
+    tracked_elsewhere = configured_pools(hass, exclude_entry_id=entry.entry_id)
+    for pool in entry_pools(entry):
+        if (pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS].lower()) in tracked_elsewhere:
+            continue
+        cache.async_remove(pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS])
+        ohlcv_store.async_remove(pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS])
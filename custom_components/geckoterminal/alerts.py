@@ -0,0 +1,176 @@
+"""Price alert rules evaluated by the GeckoTerminal data sources."""
+from dataclasses import dataclass
+
+from . import DOMAIN
+
+# Zdarzenie wysyłane na magistralę Home Assistant, gdy reguła zostanie spełniona
+ALERT_EVENT = f"{DOMAIN}_alert"
+
+ALERT_ABOVE = "above"
+ALERT_BELOW = "below"
+ALERT_CHANGE = "change"
+ALERT_RISE = "rise"
+ALERT_DROP = "drop"
+
+_CROSSING_KINDS = (ALERT_ABOVE, ALERT_BELOW)
+_MOVE_KINDS = (ALERT_CHANGE, ALERT_RISE, ALERT_DROP)
+
+_WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+# Okna, dla których API podaje zmianę ceny - obejmuje też ruchy między odpytaniami
+_API_WINDOWS = {300: "price_change_m5", 3600: "price_change_h1", 21600: "price_change_h6", 86400: "price_change_h24"}
+
+
+@dataclass(frozen=True, slots=True)
+class AlertRule:
+    """One alert rule, e.g. "above 1.25" or "change 5 5m"."""
+
+    kind: str
+    threshold: float
+    # Okno w sekundach dla reguł zmiany ceny
+    window: int | None
+    # (sieć, adres puli małymi literami) albo None dla wszystkich pul wpisu
+    target: tuple[str, str] | None
+    text: str
+
+    def applies_to(self, network, pool_address):
+        """Return True if the rule applies to the given pool."""
+        return self.target is None or self.target == (network, pool_address.lower())
+
+
+def _parse_window(value):
+    """Parse a window like "5m", "1h" or "1d" into seconds."""
+    unit = _WINDOW_UNITS.get(value[-1:].lower())
+    if unit is None:
+        raise ValueError(value)
+    amount = int(value[:-1])
+    if amount <= 0:
+        raise ValueError(value)
+    return amount * unit
+
+
+def parse_alert_rules(text):
+    """Parse alert rules, one per line.
+
+    Each line is "[network/pool_address] above|below PRICE" or
+    "[network/pool_address] change|rise|drop PERCENT WINDOW" with a window
+    such as 5m, 1h or 1d. Lines without a pool apply to every pool of the
+    entry. Returns (rules, invalid_lines).
+    """
+    rules = []
+    invalid = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        target = None
+        if "/" in parts[0]:
+            network, _, pool_address = parts.pop(0).partition("/")
+            if not network or not pool_address:
+                # "/0xabc" albo "eth/" nie wskazuje żadnej puli
+                invalid.append(line)
+                continue
+            target = (network.lower(), pool_address.lower())
+        try:
+            kind = parts[0].lower()
+            threshold = float(parts[1])
+            if kind in _CROSSING_KINDS and len(parts) == 2:
+                window = None
+            elif kind in _MOVE_KINDS and len(parts) == 3 and threshold > 0:
+                window = _parse_window(parts[2])
+            else:
+                raise ValueError(line)
+        except (IndexError, ValueError):
+            invalid.append(line)
+            continue
+        rules.append(AlertRule(kind, threshold, window, target, line))
+    return rules, invalid
+
+
+class AlertEvaluator:
+    """Edge-triggered evaluation of a pool's alert rules.
+
+    A rule fires once when its condition becomes true and is re-armed when
+    the condition no longer holds, so a price hovering above a threshold
+    does not produce an event on every update.
+    """
+
+    __slots__ = ("_rules", "_active", "_last_price")
+
+    def __init__(self, rules):
+        """Initialize the evaluator."""
+        self._rules = tuple(rules)
+        self._active = {}
+        self._last_price = None
+
+    @property
+    def rules(self):
+        """Return the evaluated rules."""
+        return self._rules
+
+    def __bool__(self):
+        """Return True if there is any rule to evaluate."""
+        return bool(self._rules)
+
+    def evaluate(self, snapshot, history, now):
+        """Return [(rule, details)] of the rules that fired for this snapshot."""
+        price = snapshot.price_usd
+        if price is None:
+            return []
+        previous = self._last_price
+        self._last_price = price
+
+        fired = []
+        for rule in self._rules:
+            if rule.kind in _CROSSING_KINDS:
+                # Przejście przez próg jest wykrywane bezpośrednio z dwóch kolejnych cen
+                if previous is not None and (
+                    (rule.kind == ALERT_ABOVE and previous <= rule.threshold < price)
+                    or (rule.kind == ALERT_BELOW and previous >= rule.threshold > price)
+                ):
+                    fired.append((rule, {"previous_price": previous}))
+                continue
+
+            change, reference = self._change(rule, snapshot, history, now, price)
+            met = change is not None and (
+                (rule.kind == ALERT_CHANGE and abs(change) >= rule.threshold)
+                or (rule.kind == ALERT_RISE and change >= rule.threshold)
+                or (rule.kind == ALERT_DROP and -change >= rule.threshold)
+            )
+            if met and not self._active.get(rule):
+                fired.append((rule, {"change_percent": round(change, 4), "reference_price": reference}))
+            self._active[rule] = met
+        return fired
+
+    @staticmethod
+    def _change(rule, snapshot, history, now, price):
+        """Return (percent change over the rule's window, reference price).
+
+        The change from the sampled history and the one reported by the API
+        are checked separately; the one that goes furthest in the rule's
+        direction is returned.
+        """
+        candidates = []
+        if history is not None:
+            reference = history.price_at(now - rule.window)
+            if reference is None:
+                # Historia jest krótsza niż okno - porównaj z najstarszą próbką
+                stats = history.stats(rule.window, now)
+                reference = stats["open"] if stats else None
+            if reference:
+                candidates.append(((price - reference) / reference * 100, reference))
+
+        api_field = _API_WINDOWS.get(rule.window)
+        api_change = getattr(snapshot, api_field) if api_field else None
+        if api_change is not None:
+            candidates.append((api_change, price / (1 + api_change / 100) if api_change > -100 else None))
+
+        if not candidates:
+            return None, None
+        # Spadek w jednym źródle nie może zasłonić wzrostu w drugim (i odwrotnie)
+        if rule.kind == ALERT_RISE:
+            return max(candidates, key=lambda candidate: candidate[0])
+        if rule.kind == ALERT_DROP:
+            return min(candidates, key=lambda candidate: candidate[0])
+        return max(candidates, key=lambda candidate: abs(candidate[0]))
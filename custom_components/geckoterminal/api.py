@@ -0,0 +1,227 @@
+"""Async HTTP client for the GeckoTerminal API."""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from . import API_BASE_URL, DATA_CLIENT, DOMAIN
+from .scheduler import async_get_scheduler
+from .stats import GeckoTerminalStats
+
+_LOGGER = logging.getLogger(__name__)
+# Tryb śledzenia zapytań: włączany poziomem DEBUG tego loggera, np.
+# logger: logs: custom_components.geckoterminal.api.trace: debug
+_TRACE_LOGGER = logging.getLogger(f"{__name__}.trace")
+
+# W trybie śledzenia rejestrowane jest co n-te zapytanie
+TRACE_SAMPLE_EVERY = 10
+
+REQUEST_TIMEOUT = 10  # sekundy
+
+# Sesja Home Assistant ustawia własne nagłówki domyślne (User-Agent), więc
+# nagłówki API są dołączane do każdego zapytania
+REQUEST_HEADERS = {"Accept": "application/json"}
+
+# Liczba adresów URL, dla których pamiętamy ETag i skrót ostatniej odpowiedzi
+VALIDATOR_CACHE_SIZE = 256
+
+# Liczba odpowiedzi przechowywanych w krótkotrwałej pamięci podręcznej
+RESPONSE_CACHE_SIZE = 64
+
+# Zwracane zamiast danych, gdy odpowiedź nie zmieniła się od poprzedniego zapytania
+NOT_MODIFIED = object()
+
+
+class GeckoTerminalApiError(Exception):
+    """Error raised when a GeckoTerminal API request fails."""
+
+    def __init__(self, message, status=None):
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+
+
+class GeckoTerminalRateLimitError(GeckoTerminalApiError):
+    """Error raised when the API rejects a request with HTTP 429."""
+
+    def __init__(self, message, retry_after=None):
+        """Initialize the error."""
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value):
+    """Return the Retry-After header value in seconds, if it can be parsed."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt_util.UTC)
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
+
+
+@callback
+def async_get_client(hass: HomeAssistant):
+    """Return the integration-wide API client, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    client = domain_data.get(DATA_CLIENT)
+    if client is None:
+        client = GeckoTerminalApiClient(hass, async_get_scheduler(hass))
+        domain_data[DATA_CLIENT] = client
+    return client
+
+
+class GeckoTerminalApiClient:
+    """Shared GeckoTerminal client with a pooled keep-alive session.
+
+    The session comes from Home Assistant's aiohttp helper, which brings its
+    SSL context, user agent and connection pool, and closes it on shutdown.
+    """
+
+    def __init__(self, hass: HomeAssistant, scheduler, base_url=API_BASE_URL):
+        """Initialize the client."""
+        self.hass = hass
+        self._scheduler = scheduler
+        self._base_url = base_url
+        self._session = None
+        # Klucz zapytania -> (ETag, skrót treści) ostatniej odpowiedzi
+        self._validators = OrderedDict()
+        # Klucz zapytania -> (czas wygaśnięcia, dane) dla zapytań z cache_ttl
+        self._responses = OrderedDict()
+        self._stats = GeckoTerminalStats()
+        self._traced = 0
+
+    @property
+    def scheduler(self):
+        """Return the request scheduler."""
+        return self._scheduler
+
+    @property
+    def base_url(self):
+        """Return the API base URL."""
+        return self._base_url
+
+    @property
+    def stats(self):
+        """Return the request statistics."""
+        return self._stats
+
+    @property
+    def session(self):
+        """Return the shared keep-alive session (e.g. for streaming transports)."""
+        return self._get_session()
+
+    def _get_session(self):
+        """Return the shared session, creating it on first use."""
+        if self._session is None:
+            self._session = async_create_clientsession(
+                self.hass, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+        return self._session
+
+    async def async_get_json(
+        self, path, params=None, conditional=False, cache_ttl=None, network=None
+    ):
+        """Perform a GET request against the API and return the decoded JSON.
+
+        With conditional=True the request carries If-None-Match when an ETag
+        is known, and NOT_MODIFIED is returned instead of the payload when the
+        server answers 304 or sends a body identical to the previous one.
+
+        With cache_ttl (seconds) a decoded response is reused for repeated
+        identical requests, e.g. while the user goes back and forth in a form.
+
+        network only attributes the request to that network's statistics.
+        """
+        url = f"{self._base_url}{path}"
+        key = (path, tuple(sorted(params.items())) if params else None)
+        if cache_ttl:
+            cached = self._responses.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._stats.record_cache_hit(network)
+                return cached[1]
+        etag, digest = self._validators.get(key, (None, None)) if conditional else (None, None)
+        headers = {**REQUEST_HEADERS, "If-None-Match": etag} if etag else REQUEST_HEADERS
+
+        session = self._get_session()
+        await self._scheduler.async_acquire()
+        started = time.monotonic()
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status == 304 and conditional:
+                    self._validators.move_to_end(key)
+                    self._record(network, path, started, 304, not_modified=True)
+                    return NOT_MODIFIED
+                if response.status == 429:
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                    self._scheduler.async_defer(retry_after)
+                    raise GeckoTerminalRateLimitError(
+                        "API zwróciło kod statusu 429 (limit zapytań)", retry_after
+                    )
+                if response.status != 200:
+                    raise GeckoTerminalApiError(
+                        f"API zwróciło kod statusu {response.status}", response.status
+                    )
+                body = await response.read()
+                new_etag = response.headers.get("ETag")
+        except GeckoTerminalApiError as e:
+            self._record(network, path, started, e.status)
+            raise
+        except (aiohttp.ClientError, TimeoutError) as e:
+            self._record(network, path, started, None)
+            raise GeckoTerminalApiError(f"Błąd połączenia z GeckoTerminal: {e}") from e
+
+        unchanged = False
+        if conditional:
+            new_digest = hashlib.blake2b(body, digest_size=16).digest()
+            self._validators[key] = (new_etag, new_digest)
+            self._validators.move_to_end(key)
+            if len(self._validators) > VALIDATOR_CACHE_SIZE:
+                self._validators.popitem(last=False)
+            unchanged = new_digest == digest
+        self._record(network, path, started, 200, len(body), unchanged)
+        if unchanged:
+            # Serwer nie obsługuje ETag, ale treść jest identyczna - pomiń parsowanie
+            return NOT_MODIFIED
+
+        try:
+            data = json_loads(body)
+        except ValueError as e:
+            raise GeckoTerminalApiError(f"Nieprawidłowa odpowiedź JSON: {e}") from e
+
+        if cache_ttl:
+            self._responses[key] = (time.monotonic() + cache_ttl, data)
+            self._responses.move_to_end(key)
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return data
+
+    def _record(self, network, path, started, status, size=0, not_modified=False):
+        """Record a finished request in the statistics and the sampled trace."""
+        latency = time.monotonic() - started
+        self._stats.record_request(network, latency, status, size, not_modified)
+        # Bez włączonego śledzenia nic nie jest formatowane ani zapisywane
+        if not _TRACE_LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        self._traced += 1
+        if self._traced % TRACE_SAMPLE_EVERY:
+            return
+        self._stats.record_trace(network, path, latency, status, size, not_modified)
+        _TRACE_LOGGER.debug(
+            "trace network=%s path=%s status=%s latency_ms=%.1f bytes=%d not_modified=%s",
+            network, path, status, latency * 1000, size, not_modified,
+        )
@@ -0,0 +1,103 @@
+"""Persistent cache of the last known GeckoTerminal pool data."""
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from . import DATA_POOL_CACHE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.pool_cache"
+
+# Zapisy na dysk są łączone, żeby nie zapisywać pliku po każdym odświeżeniu
+SAVE_DELAY = 60  # sekundy
+
+_LOAD_LOCK = "pool_cache_load_lock"
+
+
+async def async_get_pool_cache(hass: HomeAssistant):
+    """Return the loaded pool cache, loading it from disk on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_POOL_CACHE)
+    if cache is not None:
+        return cache
+
+    # Wpisy są konfigurowane równolegle - plik wczytujemy tylko raz
+    lock = domain_data.setdefault(_LOAD_LOCK, asyncio.Lock())
+    async with lock:
+        cache = domain_data.get(DATA_POOL_CACHE)
+        if cache is None:
+            cache = GeckoTerminalPoolCache(hass)
+            await cache.async_load()
+            domain_data[DATA_POOL_CACHE] = cache
+    return cache
+
+
+def _pool_key(network, pool_address):
+    """Return the cache key of a pool."""
+    return f"{network}_{pool_address.lower()}"
+
+
+class GeckoTerminalPoolCache:
+    """Last good attributes per pool, persisted with the Store helper."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._pools = {}
+        self._save_scheduled = False
+
+    async def async_load(self):
+        """Load cached pools from disk."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.error("Nie udało się wczytać pamięci podręcznej pul: %s", e)
+            stored = None
+        self._pools = (stored or {}).get("pools", {})
+
+    @callback
+    def async_get(self, network, pool_address):
+        """Return (attributes, fetched_at) of a cached pool, or None."""
+        entry = self._pools.get(_pool_key(network, pool_address))
+        if entry is None:
+            return None
+        fetched_at = dt_util.parse_datetime(entry.get("fetched_at") or "")
+        if fetched_at is None or not isinstance(entry.get("attributes"), dict):
+            return None
+        return entry["attributes"], fetched_at
+
+    @callback
+    def async_set(self, network, pool_address, attributes, fetched_at):
+        """Remember the latest attributes of a pool and schedule a save."""
+        self._pools[_pool_key(network, pool_address)] = {
+            "attributes": attributes,
+            "fetched_at": fetched_at.isoformat(),
+        }
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, network, pool_address):
+        """Forget a pool and schedule a save."""
+        if self._pools.pop(_pool_key(network, pool_address), None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self):
+        """Schedule a delayed save unless one is already pending."""
+        # Ponowne wywołanie async_delay_save przesuwa zapis - przy częstych
+        # odświeżeniach plik nie zostałby nigdy zapisany
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """Return the data to persist."""
+        self._save_scheduled = False
+        return {"pools": self._pools}
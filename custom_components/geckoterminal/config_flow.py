@@ -1,73 +1,410 @@
 """Config flow for GeckoTerminal integration."""
+import asyncio
+
 from homeassistant import config_entries
 from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+)
+from homeassistant.util import slugify
 import voluptuous as vol
 import logging
 
-from . import CONF_NAME, CONF_NETWORK, CONF_POOL_ADDRESS, DOMAIN
+from . import CONF_NAME, CONF_NETWORK, CONF_POOL_ADDRESS, CONF_POOLS, DOMAIN, configured_pools
 from . import CONF_SHOW_VOLUME, CONF_DECIMAL_PLACES, CONF_SHOW_FDV, CONF_UPDATE_INTERVAL
-from . import DEFAULT_UPDATE_INTERVAL
+from . import CONF_WARMUP_WINDOW, DEFAULT_UPDATE_INTERVAL, DEFAULT_WARMUP_WINDOW
+from . import CONF_ADAPTIVE_POLLING, CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+from . import CONF_SHOW_STATISTICS, CONF_HISTORY_BACKFILL, CONF_EXTRA_METRICS
+from . import CONF_PRICE_SOURCE, PRICE_SOURCE_POOL, PRICE_SOURCE_TOKEN, CONF_ALERT_RULES
+from . import CONF_STREAM_URL, CONF_HOLDINGS
+from .alerts import parse_alert_rules
+from .portfolio import parse_holdings
+from .api import GeckoTerminalApiError
+from .lookup import async_get_networks, async_lookup_pools, async_search_pools
 
 _LOGGER = logging.getLogger(__name__)
 
-# Lista popularnych sieci jako przykłady
-EXAMPLE_NETWORKS = [
-    "ethereum", "bsc", "polygon", "arbitrum", "optimism", "avalanche",
-    "fantom", "celo", "gnosis", "base", "zksync", "abstract"
-]
+# Sieć proponowana domyślnie w formularzu puli
+DEFAULT_NETWORK = "eth"
+# Formularz nie może czekać na API w nieskończoność - żądania czekają też w
+# kolejce limitu zapytań, więc po tym czasie pokazujemy błąd połączenia
+FLOW_REQUEST_TIMEOUT = 15  # sekundy
+
+CONF_QUERY = "query"
+CONF_POOL = "pool"
+
+# Dodatkowe metryki puli, które można włączyć jako osobne sensory
+EXTRA_METRICS = {
+    "reserve_usd": "Liquidity (reserve USD)",
+    "market_cap_usd": "Market cap",
+    "quote_price_usd": "Quote token price",
+    "volume_m5": "Volume 5m",
+    "volume_h1": "Volume 1h",
+    "volume_h6": "Volume 6h",
+    "transactions_m5": "Transactions 5m",
+    "transactions_h1": "Transactions 1h",
+    "transactions_h6": "Transactions 6h",
+    "transactions_h24": "Transactions 24h",
+}
+
+# Domyślne wartości opcji wspólnych dla pojedynczej puli i listy obserwowanych
+DEFAULT_OPTIONS = {
+    CONF_SHOW_VOLUME: True,
+    CONF_DECIMAL_PLACES: 2,
+    CONF_SHOW_FDV: True,
+    CONF_SHOW_STATISTICS: False,
+    CONF_HISTORY_BACKFILL: False,
+    CONF_EXTRA_METRICS: [],
+    CONF_PRICE_SOURCE: PRICE_SOURCE_POOL,
+    CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+    CONF_WARMUP_WINDOW: DEFAULT_WARMUP_WINDOW,
+    CONF_ADAPTIVE_POLLING: False,
+    CONF_MAX_UPDATE_INTERVAL: DEFAULT_MAX_UPDATE_INTERVAL,
+    CONF_ALERT_RULES: "",
+    CONF_HOLDINGS: "",
+    CONF_STREAM_URL: "",
+}
+
+# Schematy adresów obsługiwane przez transport strumieniowy
+STREAM_URL_SCHEMES = ("ws://", "wss://", "http://", "https://")
+
+
+def _options_schema(values):
+    """Return the schema fields of the shared display and polling options."""
+    return {
+        vol.Optional(CONF_SHOW_VOLUME, default=values[CONF_SHOW_VOLUME]): bool,
+        vol.Optional(CONF_DECIMAL_PLACES, default=values[CONF_DECIMAL_PLACES]): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=8)
+        ),
+        vol.Optional(CONF_SHOW_FDV, default=values[CONF_SHOW_FDV]): bool,
+        vol.Optional(CONF_SHOW_STATISTICS, default=values[CONF_SHOW_STATISTICS]): bool,
+        vol.Optional(CONF_HISTORY_BACKFILL, default=values[CONF_HISTORY_BACKFILL]): bool,
+        vol.Optional(CONF_EXTRA_METRICS, default=values[CONF_EXTRA_METRICS]): cv.multi_select(EXTRA_METRICS),
+        vol.Optional(CONF_PRICE_SOURCE, default=values[CONF_PRICE_SOURCE]): vol.In(
+            [PRICE_SOURCE_POOL, PRICE_SOURCE_TOKEN]
+        ),
+        vol.Optional(CONF_UPDATE_INTERVAL, default=values[CONF_UPDATE_INTERVAL]): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=60)
+        ),
+        vol.Optional(CONF_WARMUP_WINDOW, default=values[CONF_WARMUP_WINDOW]): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=300)
+        ),
+        vol.Optional(CONF_ADAPTIVE_POLLING, default=values[CONF_ADAPTIVE_POLLING]): bool,
+        vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=values[CONF_MAX_UPDATE_INTERVAL]): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=3600)
+        ),
+        vol.Optional(CONF_ALERT_RULES, default=values[CONF_ALERT_RULES]): TextSelector(
+            TextSelectorConfig(multiline=True)
+        ),
+        vol.Optional(CONF_HOLDINGS, default=values[CONF_HOLDINGS]): TextSelector(
+            TextSelectorConfig(multiline=True)
+        ),
+        vol.Optional(CONF_STREAM_URL, default=values[CONF_STREAM_URL]): str,
+    }
+
+
+def _validate_options(user_input, errors):
+    """Add errors for alert rules and holdings that cannot be parsed and unsupported stream URLs."""
+    _, invalid = parse_alert_rules(user_input.get(CONF_ALERT_RULES, ""))
+    if invalid:
+        errors[CONF_ALERT_RULES] = "invalid_alert_rules"
+    _, invalid = parse_holdings(user_input.get(CONF_HOLDINGS, ""))
+    if invalid:
+        errors[CONF_HOLDINGS] = "invalid_holdings"
+    stream_url = user_input.get(CONF_STREAM_URL, "").strip()
+    if stream_url and not stream_url.lower().startswith(STREAM_URL_SCHEMES):
+        errors[CONF_STREAM_URL] = "invalid_stream_url"
+    elif CONF_STREAM_URL in user_input:
+        user_input[CONF_STREAM_URL] = stream_url
+
+
+def parse_watchlist(text):
+    """Parse watchlist lines of the form "network/pool_address [name]".
+
+    Returns (pools, invalid_lines). Duplicate pools are skipped.
+    """
+    pools = []
+    invalid = []
+    seen = set()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        ref, _, name = line.partition(" ")
+        network, _, pool_address = ref.partition("/")
+        if not network or not pool_address:
+            invalid.append(line)
+            continue
+        key = (network.lower(), pool_address.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        pools.append({
+            CONF_NAME: name.strip() or pool_address,
+            CONF_NETWORK: network.lower(),
+            CONF_POOL_ADDRESS: pool_address,
+        })
+    return pools, invalid
+
+
+def format_watchlist(pools):
+    """Return the watchlist text for a list of pools."""
+    return "\n".join(
+        f"{pool[CONF_NETWORK]}/{pool[CONF_POOL_ADDRESS]} {pool[CONF_NAME]}" for pool in pools
+    )
+
+
+async def _async_networks(hass):
+    """Return the cached network list, or [] when the API cannot be reached."""
+    try:
+        async with asyncio.timeout(FLOW_REQUEST_TIMEOUT):
+            return await async_get_networks(hass)
+    except (GeckoTerminalApiError, TimeoutError) as e:
+        _LOGGER.warning("Nie udało się pobrać listy sieci GeckoTerminal: %s", e)
+        return []
+
+
+def _network_field(networks):
+    """Return the network field: a dropdown of known networks or free text."""
+    if not networks:
+        return str
+    return SelectSelector(
+        SelectSelectorConfig(
+            options=[
+                SelectOptionDict(value=network_id, label=f"{name} ({network_id})")
+                for network_id, name in networks
+            ],
+            custom_value=True,
+            mode=SelectSelectorMode.DROPDOWN,
+        )
+    )
+
+
+async def _async_validate_pools(hass, pools):
+    """Check that the pools exist.
+
+    Returns (errors, missing pools, found attributes keyed by (network,
+    lower case address)).
+    """
+    try:
+        async with asyncio.timeout(FLOW_REQUEST_TIMEOUT):
+            found = await async_lookup_pools(hass, pools)
+    except (GeckoTerminalApiError, TimeoutError) as e:
+        _LOGGER.warning("Nie udało się zweryfikować pul GeckoTerminal: %s", e)
+        return {"base": "cannot_connect"}, [], {}
+    missing = [
+        pool for pool in pools
+        if (pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS].lower()) not in found
+    ]
+    return {}, missing, found
+
+
+async def _async_check_watchlist(hass, pools, exclude_entry_id=None):
+    """Check that the watchlist pools are not tracked elsewhere and exist.
+
+    Returns (errors, description placeholders, found attributes).
+    """
+    duplicates = _already_configured(hass, pools, exclude_entry_id)
+    if duplicates:
+        return {CONF_POOLS: "pools_already_configured"}, _missing_placeholder(duplicates), {}
+    errors, missing, found = await _async_validate_pools(hass, pools)
+    if missing:
+        errors[CONF_POOLS] = "pools_not_found"
+        return errors, _missing_placeholder(missing), found
+    return errors, {"pools": ""}, found
+
+
+def _missing_placeholder(missing):
+    """Return the description placeholders listing pools that were not found."""
+    return {"pools": ", ".join(f"{pool[CONF_NETWORK]}/{pool[CONF_POOL_ADDRESS]}" for pool in missing)}
+
+
+def _already_configured(hass, pools, exclude_entry_id=None):
+    """Return the pools that another entry already tracks.
+
+    Every pool has one device and one set of entity IDs, so it can be
+    tracked by one entry only.
+    """
+    configured = configured_pools(hass, exclude_entry_id)
+    return [
+        pool for pool in pools
+        if (pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS].lower()) in configured
+    ]
+
+
+def _name_unnamed_pools(pools, found):
+    """Use the pool names from the API for watchlist lines given without a name."""
+    for pool in pools:
+        attributes = found.get((pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS].lower()))
+        if attributes and pool[CONF_NAME] == pool[CONF_POOL_ADDRESS] and attributes.get("name"):
+            pool[CONF_NAME] = attributes["name"]
+    return pools
+
+
+def _watchlist_schema(values):
+    """Return the schema of the watchlist form."""
+    return vol.Schema({
+        vol.Required(CONF_NAME, default=values[CONF_NAME]): str,
+        vol.Required(CONF_POOLS, default=values[CONF_POOLS]): TextSelector(
+            TextSelectorConfig(multiline=True)
+        ),
+        **_options_schema(values),
+    })
+
 
 class GeckoTerminalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for GeckoTerminal."""
-    
+
     VERSION = 1
 
+    def __init__(self):
+        """Initialize the flow."""
+        self._search_results = {}
+        self._selected_pool = None
+
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Let the user choose between a single pool and a watchlist."""
+        return self.async_show_menu(step_id="user", menu_options=["search", "pool", "watchlist"])
+
+    async def async_step_search(self, user_input=None):
+        """Search pools by token symbol, name or address."""
         errors = {}
 
+        if user_input is not None:
+            try:
+                async with asyncio.timeout(FLOW_REQUEST_TIMEOUT):
+                    pools = await async_search_pools(
+                        self.hass, user_input[CONF_QUERY], user_input.get(CONF_NETWORK)
+                    )
+            except (GeckoTerminalApiError, TimeoutError) as e:
+                _LOGGER.warning("Wyszukiwanie pul GeckoTerminal nie powiodło się: %s", e)
+                errors["base"] = "cannot_connect"
+            else:
+                if pools:
+                    self._search_results = {
+                        f"{pool[CONF_NETWORK]}/{pool[CONF_POOL_ADDRESS]}": pool for pool in pools
+                    }
+                    return await self.async_step_search_results()
+                errors[CONF_QUERY] = "no_pools_found"
+
+        networks = await _async_networks(self.hass)
+        return self.async_show_form(
+            step_id="search",
+            data_schema=vol.Schema({
+                vol.Required(CONF_QUERY): str,
+                vol.Optional(CONF_NETWORK): _network_field(networks),
+            }),
+            errors=errors,
+        )
+
+    async def async_step_search_results(self, user_input=None):
+        """Let the user pick one of the found pools."""
+        if user_input is not None:
+            self._selected_pool = self._search_results[user_input[CONF_POOL]]
+            return await self.async_step_pool()
+
+        options = {}
+        for key, pool in self._search_results.items():
+            label = f"{pool[CONF_NAME]} ({pool[CONF_NETWORK]})"
+            try:
+                label += f" - płynność {float(pool['reserve_usd']):,.0f} USD"
+            except (TypeError, ValueError):
+                pass
+            options[key] = label
+
+        return self.async_show_form(
+            step_id="search_results",
+            data_schema=vol.Schema({vol.Required(CONF_POOL): vol.In(options)}),
+        )
+
+    async def async_step_pool(self, user_input=None):
+        """Handle adding a single pool."""
+        errors = {}
+        placeholders = {}
+
         if user_input is not None:
             # Utworzenie unikalnego ID na podstawie sieci i adresu puli
             unique_id = f"{user_input[CONF_NETWORK]}_{user_input[CONF_POOL_ADDRESS]}"
             await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
-            
-            _LOGGER.debug(f"Konfiguracja GeckoTerminal: {user_input}")
-            return self.async_create_entry(title=user_input[CONF_NAME], data=user_input)
 
-        # Domyślne wartości
+            if _already_configured(self.hass, [user_input]):
+                # Ta sama pula na liście obserwowanych innego wpisu
+                errors[CONF_POOL_ADDRESS] = "pool_already_configured"
+            else:
+                # Błędny adres nie trafia do pętli odpytywania
+                errors, missing, _ = await _async_validate_pools(self.hass, [user_input])
+                if missing:
+                    errors[CONF_POOL_ADDRESS] = "invalid_pool_address"
+            _validate_options(user_input, errors)
+            if not errors:
+                _LOGGER.debug("Konfiguracja GeckoTerminal: %s", user_input)
+                return self.async_create_entry(title=user_input[CONF_NAME], data=user_input)
+
+        # Domyślne wartości, uzupełnione o pulę wybraną w wyszukiwarce
         suggested_values = {
             CONF_NAME: "",
-            CONF_NETWORK: "ethereum",
+            CONF_NETWORK: DEFAULT_NETWORK,
             CONF_POOL_ADDRESS: "",
-            CONF_SHOW_VOLUME: True,
-            CONF_DECIMAL_PLACES: 2,
-            CONF_SHOW_FDV: True,
-            CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL
+            **DEFAULT_OPTIONS,
         }
-        
-        # Jeśli użytkownik już wprowadził dane, zachowaj je
+        if self._selected_pool is not None:
+            suggested_values.update({
+                key: self._selected_pool[key] for key in (CONF_NAME, CONF_NETWORK, CONF_POOL_ADDRESS)
+            })
         if user_input is not None:
             suggested_values.update(user_input)
 
+        networks = await _async_networks(self.hass)
+        placeholders["examples"] = ", ".join(network_id for network_id, _ in networks[:5]) or DEFAULT_NETWORK
+
         data_schema = vol.Schema({
             vol.Required(CONF_NAME, default=suggested_values[CONF_NAME]): str,
-            vol.Required(CONF_NETWORK, default=suggested_values[CONF_NETWORK]): str,
+            vol.Required(CONF_NETWORK, default=suggested_values[CONF_NETWORK]): _network_field(networks),
             vol.Required(CONF_POOL_ADDRESS, default=suggested_values[CONF_POOL_ADDRESS]): str,
-            vol.Optional(CONF_SHOW_VOLUME, default=suggested_values[CONF_SHOW_VOLUME]): bool,
-            vol.Optional(CONF_DECIMAL_PLACES, default=suggested_values[CONF_DECIMAL_PLACES]): vol.All(
-                vol.Coerce(int), vol.Range(min=0, max=8)
-            ),
-            vol.Optional(CONF_SHOW_FDV, default=suggested_values[CONF_SHOW_FDV]): bool,
-            vol.Optional(CONF_UPDATE_INTERVAL, default=suggested_values[CONF_UPDATE_INTERVAL]): vol.All(
-                vol.Coerce(int), vol.Range(min=5, max=60)
-            ),
+            **_options_schema(suggested_values),
         })
 
         return self.async_show_form(
-            step_id="user", 
-            data_schema=data_schema, 
+            step_id="pool",
+            data_schema=data_schema,
             errors=errors,
-            description_placeholders={"examples": ", ".join(EXAMPLE_NETWORKS[:5])}
+            description_placeholders=placeholders
+        )
+
+    async def async_step_watchlist(self, user_input=None):
+        """Handle adding a watchlist of pools, possibly across networks."""
+        errors = {}
+        placeholders = {"pools": ""}
+        suggested_values = {CONF_NAME: "", CONF_POOLS: "", **DEFAULT_OPTIONS}
+
+        if user_input is not None:
+            suggested_values.update(user_input)
+            pools, invalid = parse_watchlist(user_input[CONF_POOLS])
+            if invalid or not pools:
+                errors[CONF_POOLS] = "invalid_watchlist"
+            else:
+                await self.async_set_unique_id(f"watchlist_{slugify(user_input[CONF_NAME])}")
+                self._abort_if_unique_id_configured()
+
+                errors, placeholders, found = await _async_check_watchlist(self.hass, pools)
+                _validate_options(user_input, errors)
+                if not errors:
+                    data = {**user_input, CONF_POOLS: _name_unnamed_pools(pools, found)}
+                    _LOGGER.debug("Konfiguracja listy obserwowanych GeckoTerminal: %s", data)
+                    return self.async_create_entry(title=user_input[CONF_NAME], data=data)
+
+        return self.async_show_form(
+            step_id="watchlist",
+            data_schema=_watchlist_schema(suggested_values),
+            errors=errors,
+            description_placeholders=placeholders,
         )
 
     @staticmethod
@@ -86,29 +423,42 @@ class GeckoTerminalOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
+        if CONF_POOLS in self.config_entry.data:
+            return await self.async_step_watchlist(user_input)
+
+        errors = {}
+        current = {**self.config_entry.data, **self.config_entry.options}
+
         if user_input is not None:
-            _LOGGER.debug(f"Zapisywanie opcji GeckoTerminal: {user_input}")
-            return self.async_create_entry(title="", data=user_input)
+            # Zmieniony adres lub sieć są weryfikowane tak samo jak przy dodawaniu
+            if (
+                user_input[CONF_NETWORK] != current.get(CONF_NETWORK)
+                or user_input[CONF_POOL_ADDRESS] != current.get(CONF_POOL_ADDRESS)
+            ):
+                if _already_configured(self.hass, [user_input], self.config_entry.entry_id):
+                    errors[CONF_POOL_ADDRESS] = "pool_already_configured"
+                else:
+                    errors, missing, _ = await _async_validate_pools(self.hass, [user_input])
+                    if missing:
+                        errors[CONF_POOL_ADDRESS] = "invalid_pool_address"
+            _validate_options(user_input, errors)
+            if not errors:
+                _LOGGER.debug("Zapisywanie opcji GeckoTerminal: %s", user_input)
+                return self.async_create_entry(title="", data=user_input)
 
         # Pobierz obecne ustawienia - najpierw z options, jeśli są, potem z data
         if self.config_entry.options:
             data = {**self.config_entry.options}
-            _LOGGER.debug(f"Używam opcji z config_entry.options: {data}")
+            _LOGGER.debug("Używam opcji z config_entry.options: %s", data)
         else:
             data = {**self.config_entry.data}
-            _LOGGER.debug(f"Używam opcji z config_entry.data: {data}")
-        
+            _LOGGER.debug("Używam opcji z config_entry.data: %s", data)
+
         # Dodaj brakujące opcje z domyślnymi wartościami, jeśli nie istnieją
-        if CONF_SHOW_VOLUME not in data:
-            data[CONF_SHOW_VOLUME] = True
-        if CONF_DECIMAL_PLACES not in data:
-            data[CONF_DECIMAL_PLACES] = 2
-        if CONF_SHOW_FDV not in data:
-            data[CONF_SHOW_FDV] = True
-        if CONF_UPDATE_INTERVAL not in data:
-            data[CONF_UPDATE_INTERVAL] = DEFAULT_UPDATE_INTERVAL
+        data = {**DEFAULT_OPTIONS, **data, **(user_input or {})}
+        networks = await _async_networks(self.hass)
 
-        _LOGGER.debug(f"Finalne wartości opcji do wyświetlenia: {data}")
+        _LOGGER.debug("Finalne wartości opcji do wyświetlenia: %s", data)
 
         return self.async_show_form(
             step_id="init",
@@ -121,27 +471,46 @@ class GeckoTerminalOptionsFlow(config_entries.OptionsFlow):
                     vol.Required(
                         CONF_NETWORK,
                         default=data.get(CONF_NETWORK),
-                    ): str,
+                    ): _network_field(networks),
                     vol.Required(
                         CONF_POOL_ADDRESS,
                         default=data.get(CONF_POOL_ADDRESS),
                     ): str,
-                    vol.Optional(
-                        CONF_SHOW_VOLUME,
-                        default=data.get(CONF_SHOW_VOLUME),
-                    ): bool,
-                    vol.Optional(
-                        CONF_DECIMAL_PLACES,
-                        default=data.get(CONF_DECIMAL_PLACES),
-                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=8)),
-                    vol.Optional(
-                        CONF_SHOW_FDV,
-                        default=data.get(CONF_SHOW_FDV),
-                    ): bool,
-                    vol.Optional(
-                        CONF_UPDATE_INTERVAL,
-                        default=data.get(CONF_UPDATE_INTERVAL),
-                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                    **_options_schema(data),
                 }
             ),
-        )
\ No newline at end of file
+            errors=errors,
+        )
+
+    async def async_step_watchlist(self, user_input=None):
+        """Manage the pools and options of a watchlist."""
+        errors = {}
+        placeholders = {"pools": ""}
+        data = {
+            **DEFAULT_OPTIONS,
+            **self.config_entry.data,
+            **self.config_entry.options,
+        }
+        data[CONF_POOLS] = format_watchlist(data[CONF_POOLS])
+
+        if user_input is not None:
+            data.update(user_input)
+            pools, invalid = parse_watchlist(user_input[CONF_POOLS])
+            if invalid or not pools:
+                errors[CONF_POOLS] = "invalid_watchlist"
+            else:
+                errors, placeholders, found = await _async_check_watchlist(
+                    self.hass, pools, self.config_entry.entry_id
+                )
+                _validate_options(user_input, errors)
+                if not errors:
+                    options = {**user_input, CONF_POOLS: _name_unnamed_pools(pools, found)}
+                    _LOGGER.debug("Zapisywanie opcji listy obserwowanych GeckoTerminal: %s", options)
+                    return self.async_create_entry(title="", data=options)
+
+        return self.async_show_form(
+            step_id="watchlist",
+            data_schema=_watchlist_schema(data),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
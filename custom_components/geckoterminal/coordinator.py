@@ -0,0 +1,410 @@
+"""Per-network coordinator batching GeckoTerminal pool requests."""
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from . import DATA_COORDINATORS, DOMAIN, MULTI_POOL_CHUNK_SIZE
+from .api import (
+    NOT_MODIFIED,
+    GeckoTerminalApiError,
+    GeckoTerminalRateLimitError,
+    async_get_client,
+)
+from .scheduler import BREAKER_CLOSED, BREAKER_HALF_OPEN, GeckoTerminalCircuitBreaker
+from .transport import GeckoTerminalTransport, base_token_address, pool_items
+
+_LOGGER = logging.getLogger(__name__)
+
+# Jak często koordynator sprawdza, które pule wymagają odświeżenia
+COORDINATOR_TICK = timedelta(seconds=5)
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant, network):
+    """Return the shared coordinator for a network, creating it if needed."""
+    coordinators = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+    coordinator = coordinators.get(network)
+    if coordinator is None:
+        coordinator = GeckoTerminalNetworkCoordinator(hass, network)
+        coordinators[network] = coordinator
+    return coordinator
+
+
+def phase_offset(pool_address, window):
+    """Return a stable offset in [0, window) seconds derived from a pool address."""
+    digest = hashlib.sha1(pool_address.lower().encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32 * window
+
+
+def _chunks(items, size):
+    """Split a list into consecutive chunks of at most size elements."""
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+class GeckoTerminalNetworkCoordinator(GeckoTerminalTransport):
+    """Fetch every tracked pool on one network with the multi-pool endpoint.
+
+    This is the REST polling transport; it keeps polling pools that also
+    receive streamed data, at their slower fallback interval.
+    """
+
+    def __init__(self, hass: HomeAssistant, network):
+        """Initialize the coordinator."""
+        self.hass = hass
+        self._network = network
+        self._client = async_get_client(hass)
+        self._breaker = GeckoTerminalCircuitBreaker(network)
+        # Adres puli (małe litery) -> lista źródeł danych śledzących tę pulę
+        self._sources = {}
+        # Adres puli (małe litery) -> adres w oryginalnej postaci; adresy
+        # niektórych sieci (np. Solana) rozróżniają wielkość liter
+        self._addresses = {}
+        # Adres puli -> czas (monotoniczny) następnego planowanego odświeżenia
+        self._due = {}
+        # Pule, które nie zostały jeszcze ani razu pobrane
+        self._pending = set()
+        # Pule pominięte w ostatniej treści odpowiedzi (lub z nieprawidłową
+        # treścią) - identyczna kolejna odpowiedź nie może ich przywrócić
+        self._missing = set()
+        # Adres tokenu (małe litery) -> wspólna cena i termin jej odświeżenia
+        self._token_prices = {}
+        self._token_due = {}
+        self._lock = asyncio.Lock()
+        self._unsub_tick = None
+
+    @property
+    def network(self):
+        """Return the network handled by this coordinator."""
+        return self._network
+
+    @property
+    def breaker(self):
+        """Return the circuit breaker of this network."""
+        return self._breaker
+
+    @callback
+    def async_add_source(self, source, delay=0):
+        """Start tracking a data source, first refreshing it after delay seconds."""
+        address = source.pool_address.lower()
+        if address not in self._sources:
+            self._due[address] = time.monotonic() + delay
+            self._pending.add(address)
+            self._addresses[address] = source.pool_address
+        self._sources.setdefault(address, []).append(source)
+        source.attach(self)
+
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._async_tick, COORDINATOR_TICK
+            )
+
+    @callback
+    def async_remove_source(self, source):
+        """Stop tracking a data source and drop the coordinator when idle."""
+        address = source.pool_address.lower()
+        sources = self._sources.get(address, [])
+        if source in sources:
+            sources.remove(source)
+        if not sources:
+            self._sources.pop(address, None)
+            self._addresses.pop(address, None)
+            self._due.pop(address, None)
+            self._pending.discard(address)
+            self._missing.discard(address)
+
+        if self._sources:
+            return
+
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        coordinators = self.hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+        if coordinators.get(self._network) is self:
+            coordinators.pop(self._network)
+
+    @callback
+    def async_reschedule(self, source):
+        """Bring a pool's next refresh forward after its interval was shortened."""
+        address = source.pool_address.lower()
+        if address in self._due and address not in self._pending:
+            self._due[address] = min(
+                self._due[address], time.monotonic() + self._interval(address)
+            )
+        # Cena tokenu zostanie przeliczona z nowym odstępem przy następnym pobraniu
+        if source.base_token_address:
+            self._token_due.pop(source.base_token_address.lower(), None)
+
+    def _interval(self, address):
+        """Return the shortest update interval requested for a pool."""
+        interval = min(source.update_interval for source in self._sources[address])
+        if all(source.adaptive for source in self._sources[address]):
+            # Gdy zapytania czekają w kolejce, pule adaptacyjne zwalniają,
+            # żeby zmieścić się w globalnym limicie
+            interval *= 1 + self._client.scheduler.backlog
+        return interval
+
+    def _collect_due(self, now):
+        """Return pool addresses that should be part of the next batch."""
+        due = [address for address, when in self._due.items() if when <= now]
+        if not due:
+            return []
+
+        # Dociągnij pule, które i tak wkrótce wymagałyby odświeżenia (lub
+        # czekają na pierwsze pobranie w oknie rozgrzewki), o ile zmieszczą
+        # się w niepełnych paczkach - to nie kosztuje dodatkowych zapytań.
+        spare = -len(due) % MULTI_POOL_CHUNK_SIZE
+        if spare:
+            upcoming = sorted(
+                (
+                    (when, address)
+                    for address, when in self._due.items()
+                    if when > now and (
+                        address in self._pending
+                        or when - now <= self._interval(address) / 2
+                    )
+                ),
+            )
+            due.extend(address for _, address in upcoming[:spare])
+        return due
+
+    async def _async_tick(self, _now=None):
+        """Refresh every pool and token price that is due."""
+        if self._lock.locked():
+            # Poprzednia runda jeszcze trwa - pule pozostaną zaległe
+            return
+        addresses = self._collect_due(time.monotonic())
+        if addresses:
+            await self.async_refresh_pools(addresses)
+        tokens = self._collect_due_tokens(time.monotonic())
+        if tokens:
+            await self.async_refresh_tokens(tokens)
+
+    async def async_refresh_pools(self, addresses):
+        """Fetch the given pools, in chunks of the multi endpoint.
+
+        Every chunk waits for a token from the integration-wide scheduler, so
+        pools that cannot be served right away stay queued until the budget
+        allows it.
+        """
+        addresses = [
+            address.lower() for address in addresses if address.lower() in self._sources
+        ]
+        if not addresses:
+            return
+
+        async with self._lock:
+            for chunk in _chunks(addresses, MULTI_POOL_CHUNK_SIZE):
+                if not self._breaker.async_allow_request():
+                    # Obwód otwarty - pozostałe pule czekają na powrót sieci
+                    break
+                await self._async_fetch_guarded(self._async_fetch_chunk, chunk)
+
+    async def _async_fetch_guarded(self, fetch, chunk):
+        """Run one chunk fetch so that a half-open breaker never stays stuck.
+
+        A probe that ended without a result - its pools were removed
+        meanwhile, it was cancelled or it raised - is given back, so the next
+        round can probe the network again.
+        """
+        probe = self._breaker.state == BREAKER_HALF_OPEN
+        try:
+            await fetch(chunk)
+        finally:
+            if probe and self._breaker.state == BREAKER_HALF_OPEN:
+                self._breaker.async_release_probe()
+
+    async def _async_fetch_chunk(self, addresses):
+        """Fetch one chunk of pools and fan the results out to data sources."""
+        # Źródła mogły zostać usunięte w trakcie oczekiwania na poprzednią paczkę
+        addresses = [address for address in addresses if address in self._sources]
+        if not addresses:
+            return
+        path = f"/networks/{self._network}/pools/multi/{','.join(self._addresses[address] for address in addresses)}"
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Pobieranie %d pul z sieci %s", len(addresses), self._network)
+
+        now = time.monotonic()
+        for address in addresses:
+            self._due[address] = now + self._interval(address)
+            self._pending.discard(address)
+
+        try:
+            response = await self._client.async_get_json(
+                path, conditional=True, network=self._network
+            )
+        except GeckoTerminalRateLimitError:
+            # Limit zapytań nie oznacza, że dane są nieaktualne - zachowaj
+            # ostatnie wartości i spróbuj ponownie, gdy harmonogram na to pozwoli
+            retry_at = time.monotonic() + self._client.scheduler.paused_for
+            for address in addresses:
+                self._due[address] = retry_at
+            if self._breaker.state != BREAKER_CLOSED:
+                # Zapytanie próbne nie dostało odpowiedzi - spróbuj ponownie później
+                self._breaker.async_record_failure()
+            return
+        except GeckoTerminalApiError as e:
+            _LOGGER.error("Błąd pobierania danych z GeckoTerminal: %s", e)
+            response = None
+
+        if response is NOT_MODIFIED:
+            # Dane się nie zmieniły - bez parsowania i bez zapisów stanu.
+            # Pule brakujące w tej samej treści pozostają niedostępne.
+            self._breaker.async_record_success()
+            for address in addresses:
+                if address in self._missing:
+                    continue
+                for source in list(self._sources.get(address, [])):
+                    source.async_mark_fresh()
+            return
+
+        if not isinstance(response, dict) or not isinstance(response.get("data"), list):
+            _LOGGER.error("Brak poprawnej odpowiedzi z GeckoTerminal API dla sieci %s", self._network)
+            if response is not None:
+                # Klient zapamiętał skrót tej treści - jej powtórka wróci jako NOT_MODIFIED
+                self._missing.update(addresses)
+            self._breaker.async_record_failure()
+            self._async_mark_unavailable(addresses)
+            return
+
+        self._breaker.async_record_success()
+
+        received = {}
+        for item in pool_items(response):
+            attributes = item["attributes"]
+            received[attributes["address"].lower()] = (
+                attributes, base_token_address(item, self._network)
+            )
+
+        for address in addresses:
+            if address not in received:
+                _LOGGER.error("Pula %s nie została zwrócona przez API dla sieci %s", address, self._network)
+                self._missing.add(address)
+                self._async_mark_unavailable([address])
+                continue
+            self._missing.discard(address)
+            attributes, token_address = received[address]
+            for source in list(self._sources.get(address, [])):
+                source.async_set_data(attributes, token_address)
+
+    def _token_sources(self):
+        """Return {token address (lower case): [data sources]} of token-priced pools."""
+        tokens = {}
+        for sources in self._sources.values():
+            for source in sources:
+                if source.token_mode and source.base_token_address:
+                    tokens.setdefault(source.base_token_address.lower(), []).append(source)
+        return tokens
+
+    def _collect_due_tokens(self, now):
+        """Return token addresses whose shared price should be refreshed."""
+        tokens = self._token_sources()
+        # Zapomnij tokeny, których żadna pula już nie używa
+        for token in set(self._token_due) - set(tokens):
+            self._token_due.pop(token)
+            self._token_prices.pop(token, None)
+        return [
+            token for token in tokens
+            if self._token_due.get(token, 0) <= now
+        ]
+
+    async def async_refresh_tokens(self, tokens):
+        """Fetch shared token prices with the simple token-price endpoint.
+
+        Each token is requested once no matter how many pools use it, and the
+        price is fanned out to every token-priced pool with that base token.
+        """
+        async with self._lock:
+            for chunk in _chunks(tokens, MULTI_POOL_CHUNK_SIZE):
+                if not self._breaker.async_allow_request():
+                    break
+                await self._async_fetch_guarded(self._async_fetch_token_chunk, chunk)
+
+    async def _async_fetch_token_chunk(self, tokens):
+        """Fetch one chunk of token prices and apply them."""
+        token_sources = self._token_sources()
+        tokens = [token for token in tokens if token in token_sources]
+        if not tokens:
+            return
+
+        now = time.monotonic()
+        for token in tokens:
+            self._token_due[token] = now + min(
+                source.price_interval for source in token_sources[token]
+            )
+
+        originals = [token_sources[token][0].base_token_address for token in tokens]
+        path = f"/simple/networks/{self._network}/token_price/{','.join(originals)}"
+        try:
+            response = await self._client.async_get_json(
+                path, conditional=True, network=self._network
+            )
+        except GeckoTerminalRateLimitError:
+            retry_at = time.monotonic() + self._client.scheduler.paused_for
+            for token in tokens:
+                self._token_due[token] = retry_at
+            if self._breaker.state != BREAKER_CLOSED:
+                self._breaker.async_record_failure()
+            return
+        except GeckoTerminalApiError as e:
+            _LOGGER.error("Błąd pobierania cen tokenów z GeckoTerminal: %s", e)
+            self._breaker.async_record_failure()
+            return
+
+        self._breaker.async_record_success()
+        if response is NOT_MODIFIED:
+            return
+
+        try:
+            prices = response["data"]["attributes"]["token_prices"]
+        except (KeyError, TypeError):
+            _LOGGER.error("Nieprawidłowa odpowiedź z cenami tokenów dla sieci %s", self._network)
+            return
+
+        for token_address, value in prices.items():
+            try:
+                price = float(value)
+            except (TypeError, ValueError):
+                continue
+            token = token_address.lower()
+            self._token_prices[token] = price
+            for source in token_sources.get(token, []):
+                source.async_set_token_price(price)
+
+    @callback
+    def async_token_price(self, token_address):
+        """Return the last shared price of a token, or None."""
+        return self._token_prices.get(token_address.lower())
+
+    @callback
+    def async_diagnostics(self):
+        """Return the scheduling and breaker state for diagnostics."""
+        now = time.monotonic()
+        return {
+            "pools": len(self._sources),
+            "pending": len(self._pending),
+            "tokens": len(self._token_due),
+            "breaker_state": self._breaker.state,
+            "breaker_open_for": round(self._breaker.open_for, 1),
+            "next_refresh_in": {
+                self._addresses[address]: round(max(0.0, when - now), 1)
+                for address, when in self._due.items()
+            },
+            "intervals": {
+                self._addresses[address]: round(self._interval(address), 1)
+                for address in self._sources
+            },
+        }
+
+    @callback
+    def _async_mark_unavailable(self, addresses):
+        """Mark the data sources of the given pools as unavailable."""
+        for address in addresses:
+            for source in list(self._sources.get(address, [])):
+                source.async_set_unavailable()
+
@@ -0,0 +1,69 @@
+"""Diagnostics support for GeckoTerminal."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import CONF_HOLDINGS, CONF_STREAM_URL, DATA_COORDINATORS, DATA_ENTRY_MANAGERS, DATA_STREAMS, DOMAIN
+from .api import async_get_client
+from .portfolio import async_get_portfolio
+
+# Adres przekaźnika może zawierać dane logowania lub token, a posiadane ilości
+# i wartość portfela to dane prywatne użytkownika
+TO_REDACT = {CONF_STREAM_URL, CONF_HOLDINGS}
+PORTFOLIO_TO_REDACT = {"value", "change_h24"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return diagnostics for a config entry."""
+    client = async_get_client(hass)
+    scheduler = client.scheduler
+    domain_data = hass.data.get(DOMAIN, {})
+    coordinators = domain_data.get(DATA_COORDINATORS, {})
+    manager = domain_data.get(DATA_ENTRY_MANAGERS, {}).get(entry.entry_id)
+
+    pools = []
+    for tracked in manager.tracked_pools if manager is not None else []:
+        data_source = tracked.data_source
+        pools.append({
+            "network": data_source.network,
+            "pool_address": data_source.pool_address,
+            "available": data_source.available,
+            "stale": data_source.stale,
+            "fetched_at": data_source.fetched_at.isoformat() if data_source.fetched_at else None,
+            "update_interval": data_source.update_interval,
+            "price_interval": data_source.price_interval,
+            "adaptive": data_source.adaptive,
+            "volatility": data_source.volatility,
+            "token_mode": data_source.token_mode,
+            "streaming": data_source.streaming,
+            "history_samples": len(data_source.history),
+            "entities": sorted(tracked.entities),
+        })
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "pools": pools,
+        "scheduler": {
+            "rate_per_second": scheduler.rate,
+            "backlog": scheduler.backlog,
+            "paused_for": round(scheduler.paused_for, 1),
+        },
+        "requests": client.stats.as_dict(),
+        "networks": {
+            network: coordinator.async_diagnostics()
+            for network, coordinator in coordinators.items()
+        },
+        "portfolio": async_redact_data(async_get_portfolio(hass).as_dict(), PORTFOLIO_TO_REDACT),
+        "streams": [
+            {
+                "connected": stream.connected,
+                "messages": stream.messages,
+                "pools": stream.pool_count,
+                "streaming_pools": stream.streaming_pool_count,
+            }
+            for stream in domain_data.get(DATA_STREAMS, {}).values()
+        ],
+    }
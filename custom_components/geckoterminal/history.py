@@ -0,0 +1,121 @@
+"""Compact in-memory price history for GeckoTerminal pools."""
+from array import array
+
+# 24 godziny próbek co 30 sekund
+HISTORY_SIZE = 2880
+# Próbki z tego samego przedziału o tej długości zastępują poprzednią zamiast
+# zajmować nowe miejsce
+HISTORY_RESOLUTION = 30  # sekundy
+
+
+class PriceHistory:
+    """Fixed-size ring buffer of (timestamp, price, volume) samples.
+
+    Samples are kept in three preallocated arrays instead of a list of dicts,
+    so a pool costs a constant ~20 bytes per sample regardless of how long
+    Home Assistant has been running.
+    """
+
+    __slots__ = ("_size", "_resolution", "_times", "_prices", "_volumes", "_next", "_count")
+
+    def __init__(self, size=HISTORY_SIZE, resolution=HISTORY_RESOLUTION):
+        """Initialize the buffer."""
+        self._size = size
+        self._resolution = resolution
+        self._times = array("d", bytes(8 * size))
+        self._prices = array("d", bytes(8 * size))
+        self._volumes = array("f", bytes(4 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        """Return the number of stored samples."""
+        return self._count
+
+    @property
+    def last_time(self):
+        """Return the timestamp of the newest sample, or None."""
+        if not self._count:
+            return None
+        return self._times[(self._next - 1) % self._size]
+
+    def append(self, timestamp, price, volume=0.0):
+        """Add a sample; samples must be appended in chronological order."""
+        last = self.last_time
+        if last is not None and timestamp < last:
+            return
+        if last is not None and timestamp // self._resolution == last // self._resolution:
+            # Nadpisz ostatnią próbkę, żeby szybkie odpytywanie nie skracało historii.
+            # Porównujemy przedziały, a nie odstęp od ostatniej próbki - inaczej
+            # odpytywanie częstsze niż co 30 s nadpisywałoby ją w nieskończoność.
+            index = (self._next - 1) % self._size
+        else:
+            index = self._next
+            self._next = (self._next + 1) % self._size
+            self._count = min(self._count + 1, self._size)
+        self._times[index] = timestamp
+        self._prices[index] = price
+        self._volumes[index] = volume
+
+    def seed(self, samples):
+        """Fill an empty buffer with older (timestamp, price, volume) samples."""
+        if self._count:
+            return
+        for timestamp, price, volume in samples:
+            self.append(timestamp, price, volume)
+
+    def _newest_first(self, since):
+        """Yield (timestamp, price, volume) from the newest sample back to since."""
+        times, prices, volumes, size = self._times, self._prices, self._volumes, self._size
+        index = self._next
+        for _ in range(self._count):
+            index = (index - 1) % size
+            timestamp = times[index]
+            if timestamp < since:
+                return
+            yield timestamp, prices[index], volumes[index]
+
+    def price_at(self, timestamp):
+        """Return the price of the newest sample not newer than timestamp."""
+        times, size = self._times, self._size
+        index = self._next
+        for _ in range(self._count):
+            index = (index - 1) % size
+            if times[index] <= timestamp:
+                return self._prices[index]
+        return None
+
+    def stats(self, window, now):
+        """Return rolling statistics of the last window seconds, or None.
+
+        The result holds min, max, mean, VWAP (weighted by the sampled
+        volume) and OHLC of the prices in the window.
+        """
+        count = 0
+        total = 0.0
+        weighted = 0.0
+        volume_total = 0.0
+        low = high = close = open_ = None
+        for _, price, volume in self._newest_first(now - window):
+            if close is None:
+                close = low = high = price
+            low = min(low, price)
+            high = max(high, price)
+            open_ = price
+            total += price
+            weighted += price * volume
+            volume_total += volume
+            count += 1
+        if not count:
+            return None
+        return {
+            "min": low,
+            "max": high,
+            "mean": total / count,
+            "vwap": weighted / volume_total if volume_total else None,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "samples": count,
+        }
@@ -0,0 +1,110 @@
+"""Network list, pool search and pool validation for the config flow."""
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from . import CONF_NAME, CONF_NETWORK, CONF_POOL_ADDRESS, MULTI_POOL_CHUNK_SIZE
+from .api import GeckoTerminalApiError, async_get_client
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lista sieci zmienia się rzadko - wystarczy pobrać ją raz na dobę
+NETWORKS_CACHE_TTL = 86400  # sekundy
+# Wyniki wyszukiwania i walidacji są potrzebne tylko w trakcie wypełniania formularza
+SEARCH_CACHE_TTL = 120  # sekundy
+VALIDATION_CACHE_TTL = 300  # sekundy
+# Zabezpieczenie przed zapętleniem stronicowania /networks
+MAX_NETWORK_PAGES = 10
+
+
+async def async_get_networks(hass: HomeAssistant):
+    """Return [(network id, name)] of the networks supported by the API."""
+    client = async_get_client(hass)
+    networks = []
+    for page in range(1, MAX_NETWORK_PAGES + 1):
+        response = await client.async_get_json(
+            "/networks", {"page": page}, cache_ttl=NETWORKS_CACHE_TTL
+        )
+        items = response.get("data") if isinstance(response, dict) else None
+        if not items:
+            break
+        for item in items:
+            if not isinstance(item, dict) or not item.get("id"):
+                continue
+            attributes = item.get("attributes") or {}
+            networks.append((item["id"], attributes.get("name") or item["id"]))
+        if not (response.get("links") or {}).get("next"):
+            break
+    return networks
+
+
+def _pool_network(item):
+    """Return the network id of a pool from its relationships or its id."""
+    try:
+        return item["relationships"]["network"]["data"]["id"]
+    except (KeyError, TypeError):
+        pass
+    # Identyfikator puli ma postać "{sieć}_{adres}", a adresy nie zawierają "_"
+    return (item.get("id") or "").rpartition("_")[0] or None
+
+
+async def async_search_pools(hass: HomeAssistant, query, network=None):
+    """Search pools by token symbol, name or address.
+
+    Returns a list of pool dicts (name, network, pool_address) with an extra
+    "reserve_usd" used to label the results.
+    """
+    params = {"query": query}
+    if network:
+        params["network"] = network
+    response = await async_get_client(hass).async_get_json(
+        "/search/pools", params, cache_ttl=SEARCH_CACHE_TTL
+    )
+    items = response.get("data") if isinstance(response, dict) else None
+
+    pools = []
+    for item in items or []:
+        attributes = item.get("attributes") if isinstance(item, dict) else None
+        pool_network = _pool_network(item) if attributes else None
+        if not attributes or not attributes.get("address") or not pool_network:
+            continue
+        pools.append({
+            CONF_NAME: attributes.get("name") or attributes["address"],
+            CONF_NETWORK: pool_network,
+            CONF_POOL_ADDRESS: attributes["address"],
+            "reserve_usd": attributes.get("reserve_in_usd"),
+        })
+    return pools
+
+
+async def async_lookup_pools(hass: HomeAssistant, pools):
+    """Return {(network, address lower case): attributes} of the pools that exist.
+
+    Pools are looked up in batches with the multi-pool endpoint. An unknown
+    network counts as missing pools; other API errors are raised.
+    """
+    client = async_get_client(hass)
+    by_network = {}
+    for pool in pools:
+        by_network.setdefault(pool[CONF_NETWORK], []).append(pool[CONF_POOL_ADDRESS])
+
+    found = {}
+    for network, addresses in by_network.items():
+        for index in range(0, len(addresses), MULTI_POOL_CHUNK_SIZE):
+            chunk = addresses[index:index + MULTI_POOL_CHUNK_SIZE]
+            path = f"/networks/{network}/pools/multi/{','.join(chunk)}"
+            try:
+                response = await client.async_get_json(
+                    path, cache_ttl=VALIDATION_CACHE_TTL, network=network
+                )
+            except GeckoTerminalApiError as e:
+                if e.status == 404:
+                    _LOGGER.debug("Sieć '%s' lub pule %s nie zostały znalezione (404)", network, chunk)
+                    continue
+                raise
+            items = response.get("data") if isinstance(response, dict) else None
+            for item in items or []:
+                attributes = item.get("attributes") if isinstance(item, dict) else None
+                if attributes and attributes.get("address"):
+                    found[(network, attributes["address"].lower())] = attributes
+    return found
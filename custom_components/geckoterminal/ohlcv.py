@@ -0,0 +1,220 @@
+"""Incremental OHLCV backfill for GeckoTerminal pools."""
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from . import DATA_OHLCV_STORE, DOMAIN
+from .api import GeckoTerminalApiError, async_get_client
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.ohlcv"
+SAVE_DELAY = 120  # sekundy
+
+# Świece godzinowe - tylko takie można zaimportować jako statystyki długoterminowe
+OHLCV_TIMEFRAME = "hour"
+CANDLE_SECONDS = 3600
+# Maksymalna liczba świec w jednym zapytaniu i w lokalnym magazynie (ok. 41 dni)
+OHLCV_MAX_CANDLES = 1000
+# Jak często sprawdzać, czy pojawiły się nowe zamknięte świece
+OHLCV_SYNC_INTERVAL = timedelta(hours=1)
+# Pierwsze pobranie każdej puli jest przesunięte o stały odstęp z tego okna,
+# żeby wiele pul nie wysyłało zapytań OHLCV naraz po starcie i co godzinę
+OHLCV_SYNC_SPREAD = 600  # sekundy
+
+_LOAD_LOCK = "ohlcv_store_load_lock"
+
+
+async def async_get_ohlcv_store(hass: HomeAssistant):
+    """Return the loaded OHLCV store, loading it from disk on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get(DATA_OHLCV_STORE)
+    if store is not None:
+        return store
+
+    lock = domain_data.setdefault(_LOAD_LOCK, asyncio.Lock())
+    async with lock:
+        store = domain_data.get(DATA_OHLCV_STORE)
+        if store is None:
+            store = GeckoTerminalOhlcvStore(hass)
+            await store.async_load()
+            domain_data[DATA_OHLCV_STORE] = store
+    return store
+
+
+def statistic_id(network, pool_address):
+    """Return the external statistic ID of a pool's price."""
+    return f"{DOMAIN}:{network}_{pool_address.lower()}_price".replace("-", "_")
+
+
+def _pool_key(network, pool_address):
+    """Return the store key of a pool."""
+    return f"{network}_{pool_address.lower()}"
+
+
+class GeckoTerminalOhlcvStore:
+    """Closed hourly candles per pool, kept as compact lists on disk."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the store."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._pools = {}
+        self._save_scheduled = False
+
+    async def async_load(self):
+        """Load stored candles from disk."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.error("Nie udało się wczytać historii OHLCV: %s", e)
+            stored = None
+        self._pools = (stored or {}).get("pools", {})
+
+    @callback
+    def async_high_water_mark(self, network, pool_address):
+        """Return the timestamp of the newest stored candle, or None."""
+        return self._pools.get(_pool_key(network, pool_address), {}).get("hwm")
+
+    @callback
+    def async_candles(self, network, pool_address):
+        """Return stored candles [timestamp, open, high, low, close, volume], oldest first."""
+        return self._pools.get(_pool_key(network, pool_address), {}).get("candles", [])
+
+    @callback
+    def async_add_candles(self, network, pool_address, candles):
+        """Merge new closed candles and advance the high-water mark."""
+        entry = self._pools.setdefault(_pool_key(network, pool_address), {"hwm": None, "candles": []})
+        hwm = entry["hwm"]
+        new = sorted(candle for candle in candles if hwm is None or candle[0] > hwm)
+        if not new:
+            return []
+        entry["candles"] = (entry["candles"] + new)[-OHLCV_MAX_CANDLES:]
+        entry["hwm"] = new[-1][0]
+        self._async_schedule_save()
+        return new
+
+    @callback
+    def async_remove(self, network, pool_address):
+        """Forget a pool's candles."""
+        if self._pools.pop(_pool_key(network, pool_address), None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self):
+        """Schedule a delayed save unless one is already pending."""
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """Return the data to persist."""
+        self._save_scheduled = False
+        return {"pools": self._pools}
+
+
+async def async_sync_pool_history(hass: HomeAssistant, data_source, name):
+    """Fetch the candles missing since the high-water mark and apply them.
+
+    New candles are stored locally, used to seed an empty in-memory history
+    and imported as long-term statistics when the recorder is loaded.
+    """
+    network = data_source.network
+    pool_address = data_source.pool_address
+    store = await async_get_ohlcv_store(hass)
+
+    now = time.time()
+    # Ostatnia zamknięta świeca zaczyna się godzinę przed początkiem bieżącej
+    last_closed = (int(now) // CANDLE_SECONDS - 1) * CANDLE_SECONDS
+    hwm = store.async_high_water_mark(network, pool_address)
+    if hwm is not None and hwm >= last_closed:
+        new = []
+    else:
+        missing = OHLCV_MAX_CANDLES if hwm is None else int((last_closed - hwm) // CANDLE_SECONDS)
+        new = await _async_fetch_candles(hass, network, pool_address, min(missing, OHLCV_MAX_CANDLES), last_closed)
+        new = store.async_add_candles(network, pool_address, new)
+        if new:
+            _LOGGER.debug("Pobrano %d nowych świec OHLCV dla puli %s", len(new), pool_address)
+
+    if not len(data_source.history):
+        # Wypełnij lukę w historii po restarcie ostatnimi 24 świecami
+        candles = store.async_candles(network, pool_address)[-24:]
+        data_source.history.seed(
+            (candle[0] + CANDLE_SECONDS, candle[4], candle[5] / 12) for candle in candles
+        )
+
+    if new and "recorder" in hass.config.components:
+        _async_import_statistics(hass, network, pool_address, name, new)
+
+
+async def _async_fetch_candles(hass, network, pool_address, limit, last_closed):
+    """Fetch up to limit closed hourly candles, oldest first."""
+    path = f"/networks/{network}/pools/{pool_address}/ohlcv/{OHLCV_TIMEFRAME}"
+    params = {
+        "aggregate": 1,
+        # +1, bo odpowiedź zawiera też bieżącą, niezamkniętą świecę
+        "limit": min(limit + 1, OHLCV_MAX_CANDLES),
+        "currency": "usd",
+    }
+    try:
+        response = await async_get_client(hass).async_get_json(path, params, network=network)
+    except GeckoTerminalApiError as e:
+        _LOGGER.warning("Nie udało się pobrać historii OHLCV dla puli %s: %s", pool_address, e)
+        return []
+
+    try:
+        ohlcv_list = response["data"]["attributes"]["ohlcv_list"]
+    except (KeyError, TypeError):
+        _LOGGER.warning("Nieprawidłowa odpowiedź OHLCV dla puli %s", pool_address)
+        return []
+
+    candles = []
+    for row in ohlcv_list:
+        try:
+            candle = [int(row[0])] + [float(value) for value in row[1:6]]
+        except (TypeError, ValueError, IndexError):
+            continue
+        if candle[0] <= last_closed:
+            candles.append(candle)
+    candles.sort()
+    return candles
+
+
+@callback
+def _async_import_statistics(hass, network, pool_address, name, candles):
+    """Import hourly candles as external long-term statistics."""
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": f"{name} price",
+        "source": DOMAIN,
+        "statistic_id": statistic_id(network, pool_address),
+        "unit_of_measurement": "USD",
+    }
+    try:
+        from homeassistant.components.recorder.models import StatisticMeanType
+    except ImportError:
+        pass
+    else:
+        metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+
+    statistics = [
+        {
+            "start": dt_util.utc_from_timestamp(timestamp),
+            "mean": (high + low + close) / 3,
+            "min": low,
+            "max": high,
+            "state": close,
+        }
+        for timestamp, _open, high, low, close, _volume in candles
+    ]
+    async_add_external_statistics(hass, metadata, statistics)
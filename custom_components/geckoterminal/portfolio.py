@@ -0,0 +1,249 @@
+"""Portfolio totals computed from held token amounts."""
+from functools import partial
+
+from homeassistant.core import HomeAssistant, callback
+
+from . import DATA_PORTFOLIO, DOMAIN
+
+# Pola PoolSnapshot, od których zależy wartość pozycji
+POSITION_FIELDS = ("price_usd", "price_change_h24")
+
+
+def parse_holdings(text):
+    """Parse held amounts, one per line.
+
+    Each line is "[network/pool_address] AMOUNT" with the amount of the
+    pool's base token. A line without a pool applies to every pool of the
+    entry. Returns ({(network, pool_address) or None: amount}, invalid_lines).
+    """
+    holdings = {}
+    invalid = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        target = None
+        if "/" in parts[0]:
+            network, _, pool_address = parts.pop(0).partition("/")
+            if not network or not pool_address:
+                # "/0xabc" albo "eth/" nie wskazuje żadnej puli
+                invalid.append(line)
+                continue
+            target = (network.lower(), pool_address.lower())
+        try:
+            if len(parts) != 1:
+                raise ValueError(line)
+            amount = float(parts[0].replace(",", "."))
+            if amount < 0:
+                raise ValueError(line)
+        except ValueError:
+            invalid.append(line)
+            continue
+        holdings[target] = amount
+    return holdings, invalid
+
+
+def holding_amount(holdings, network, pool_address):
+    """Return the amount held in a pool; a pool-specific line wins over a general one."""
+    return holdings.get((network, pool_address.lower()), holdings.get(None))
+
+
+@callback
+def async_get_portfolio(hass: HomeAssistant):
+    """Return the integration-wide portfolio, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    portfolio = domain_data.get(DATA_PORTFOLIO)
+    if portfolio is None:
+        portfolio = domain_data[DATA_PORTFOLIO] = GeckoTerminalPortfolio(hass)
+    return portfolio
+
+
+class _Position:
+    """One held amount and its current contribution to the totals."""
+
+    __slots__ = ("network", "amount", "data_source", "value", "reference", "unsub")
+
+    def __init__(self, network, amount, data_source):
+        """Initialize the position."""
+        self.network = network
+        self.amount = amount
+        self.data_source = data_source
+        self.value = 0.0
+        # Wartość pozycji sprzed 24 godzin, wyliczona ze zmiany ceny podanej przez API
+        self.reference = 0.0
+        self.unsub = None
+
+
+class GeckoTerminalPortfolio:
+    """Total value, per-network value and 24h change of the held amounts.
+
+    Totals are kept as running sums: when a pool's price changes only that
+    position's difference is applied. Listener calls are coalesced, so a
+    batch of pools updated by one coordinator response writes the portfolio
+    sensors once.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the portfolio."""
+        self.hass = hass
+        # (id wpisu, sieć, adres puli małymi literami) -> _Position
+        self._positions = {}
+        # Sieć -> [wartość, wartość sprzed 24 godzin, liczba pozycji]
+        self._networks = {}
+        self._value = 0.0
+        self._reference = 0.0
+        self._listeners = []
+        # Sieci zmienione od ostatniego powiadomienia
+        self._dirty = set()
+        self._notify_scheduled = False
+
+    @property
+    def positions(self):
+        """Return the number of held positions."""
+        return len(self._positions)
+
+    @property
+    def networks(self):
+        """Return the networks with held positions."""
+        return list(self._networks)
+
+    @property
+    def value(self):
+        """Return the total value in USD, or None without positions."""
+        return self._value if self._positions else None
+
+    @property
+    def change_h24(self):
+        """Return the value-weighted 24h change in percent."""
+        if not self._reference:
+            return None
+        return (self._value - self._reference) / self._reference * 100
+
+    def network_value(self, network):
+        """Return the value held on one network in USD, or None."""
+        totals = self._networks.get(network)
+        return totals[0] if totals is not None else None
+
+    def network_change_h24(self, network):
+        """Return the value-weighted 24h change of one network in percent."""
+        totals = self._networks.get(network)
+        if totals is None or not totals[1]:
+            return None
+        return (totals[0] - totals[1]) / totals[1] * 100
+
+    def network_positions(self, network):
+        """Return the number of held positions on one network."""
+        totals = self._networks.get(network)
+        return totals[2] if totals is not None else 0
+
+    def as_dict(self):
+        """Return the totals as a plain dict."""
+        return {
+            "positions": self.positions,
+            "value": self.value,
+            "change_h24": self.change_h24,
+            "networks": {
+                network: {
+                    "value": self.network_value(network),
+                    "change_h24": self.network_change_h24(network),
+                    "positions": self.network_positions(network),
+                }
+                for network in self._networks
+            },
+        }
+
+    @callback
+    def register_listener(self, listener, network=None):
+        """Register a listener and return a callable that unregisters it.
+
+        A listener with a network is only called when that network's totals
+        change; without one it is called on every change.
+        """
+        entry = (listener, network)
+        self._listeners.append(entry)
+
+        def _remove_listener():
+            if entry in self._listeners:
+                self._listeners.remove(entry)
+
+        return _remove_listener
+
+    @callback
+    def async_set_position(self, key, data_source, amount):
+        """Hold amount of a pool's base token; a missing or zero amount removes it."""
+        position = self._positions.get(key)
+        if position is not None and position.data_source is data_source and position.amount == amount:
+            return
+        self.async_remove_position(key)
+        if not amount:
+            return
+
+        position = _Position(data_source.network, amount, data_source)
+        position.unsub = data_source.register_listener(
+            partial(self._async_position_updated, key), POSITION_FIELDS
+        )
+        self._positions[key] = position
+        self._networks.setdefault(position.network, [0.0, 0.0, 0])[2] += 1
+        self._async_apply(position)
+
+    @callback
+    def async_remove_position(self, key):
+        """Stop holding a pool."""
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        position.unsub()
+        self._async_add(position.network, -position.value, -position.reference)
+        totals = self._networks[position.network]
+        totals[2] -= 1
+        if not totals[2]:
+            self._networks.pop(position.network)
+        if not self._positions:
+            # Bez pozycji zerujemy sumy, żeby nie zostawał błąd zaokrągleń
+            self._value = self._reference = 0.0
+
+    @callback
+    def _async_position_updated(self, key):
+        """Apply a new price of one position."""
+        position = self._positions.get(key)
+        if position is not None:
+            self._async_apply(position)
+
+    @callback
+    def _async_apply(self, position):
+        """Recompute one position and add its difference to the totals."""
+        snapshot = position.data_source.snapshot
+        value = reference = 0.0
+        if snapshot is not None and snapshot.price_usd is not None:
+            value = position.amount * snapshot.price_usd
+            change = snapshot.price_change_h24
+            # Pozycja bez zmiany 24h liczy się jako niezmieniona
+            reference = value / (1 + change / 100) if change is not None and change > -100 else value
+        self._async_add(position.network, value - position.value, reference - position.reference)
+        position.value = value
+        position.reference = reference
+
+    @callback
+    def _async_add(self, network, value, reference):
+        """Add a difference to the totals and schedule the listeners."""
+        self._value += value
+        self._reference += reference
+        totals = self._networks.get(network)
+        if totals is not None:
+            totals[0] += value
+            totals[1] += reference
+        self._dirty.add(network)
+        if not self._notify_scheduled:
+            self._notify_scheduled = True
+            self.hass.loop.call_soon(self._async_notify)
+
+    @callback
+    def _async_notify(self):
+        """Call the listeners of the totals that changed."""
+        dirty = self._dirty
+        self._dirty = set()
+        self._notify_scheduled = False
+        for listener, network in list(self._listeners):
+            if network is None or network in dirty:
+                listener()
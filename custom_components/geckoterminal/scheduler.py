@@ -0,0 +1,177 @@
+"""Request scheduling and circuit breaking for the GeckoTerminal API."""
+import asyncio
+import logging
+import random
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from . import API_BURST, API_CALLS_PER_MINUTE, DATA_SCHEDULER, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Domyślny czas wstrzymania, gdy API zwróci 429 bez nagłówka Retry-After
+DEFAULT_RETRY_AFTER = 60  # sekundy
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Po tylu kolejnych błędach obwód dla sieci zostaje otwarty
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 30  # sekundy
+BREAKER_MAX_BACKOFF = 900  # sekundy
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant):
+    """Return the integration-wide request scheduler, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = GeckoTerminalRequestScheduler(API_CALLS_PER_MINUTE, API_BURST)
+        domain_data[DATA_SCHEDULER] = scheduler
+    return scheduler
+
+
+class GeckoTerminalRequestScheduler:
+    """Token bucket that queues API requests and spreads them over the budget."""
+
+    def __init__(self, calls_per_minute, burst):
+        """Initialize the scheduler."""
+        self._rate = calls_per_minute / 60
+        self._capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # asyncio.Lock wybudza oczekujących w kolejności FIFO
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+    @property
+    def rate(self):
+        """Return the sustained request rate in calls per second."""
+        return self._rate
+
+    @property
+    def backlog(self):
+        """Return the number of requests waiting for a token."""
+        return self._waiting
+
+    @property
+    def paused_for(self):
+        """Return how many seconds requests are still paused after a 429."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def _refill(self, now):
+        """Add the tokens accumulated since the last refill."""
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def async_acquire(self):
+        """Wait until a request may be sent."""
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._paused_until:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self._tokens) / self._rate)
+        finally:
+            self._waiting -= 1
+
+    @callback
+    def async_defer(self, retry_after=None):
+        """Pause all requests after the API signalled a rate limit."""
+        delay = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        # Po przerwie zaczynamy od pustego kubełka, żeby nie wysłać serii zapytań
+        self._tokens = 0.0
+        self._updated = self._paused_until
+        _LOGGER.warning("Limit zapytań GeckoTerminal przekroczony, wstrzymuję zapytania na %.0f s", delay)
+
+
+class GeckoTerminalCircuitBreaker:
+    """Per-network circuit breaker with jittered exponential backoff.
+
+    After a few consecutive failures the circuit opens and no requests are
+    sent for a randomised backoff period. Once it elapses a single probe
+    request is let through (half-open); its result either closes the circuit
+    or reopens it with a longer backoff.
+    """
+
+    def __init__(self, network):
+        """Initialize the circuit breaker."""
+        self._network = network
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened = 0
+        self._open_until = 0.0
+
+    @property
+    def state(self):
+        """Return the current breaker state."""
+        return self._state
+
+    @property
+    def open_for(self):
+        """Return how many seconds the circuit stays open."""
+        if self._state != BREAKER_OPEN:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    @callback
+    def async_allow_request(self):
+        """Return True if a request to this network may be sent now."""
+        if self._state == BREAKER_CLOSED:
+            return True
+        if self._state == BREAKER_OPEN and time.monotonic() >= self._open_until:
+            # Przepuść jedno zapytanie próbne
+            self._state = BREAKER_HALF_OPEN
+            return True
+        return False
+
+    @callback
+    def async_record_success(self):
+        """Close the circuit after a successful request."""
+        if self._state != BREAKER_CLOSED:
+            _LOGGER.info("Sieć %s znów odpowiada, wznawiam odpytywanie", self._network)
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened = 0
+
+    @callback
+    def async_record_failure(self):
+        """Register a failed request and open the circuit if needed."""
+        self._failures += 1
+        if self._state == BREAKER_HALF_OPEN or self._failures >= BREAKER_FAILURE_THRESHOLD:
+            self._open()
+
+    @callback
+    def async_release_probe(self):
+        """Give back a probe that ended without a result, e.g. when it was cancelled.
+
+        The circuit stays open, but the next request may probe the network
+        again instead of the breaker waiting forever for an outcome.
+        """
+        if self._state == BREAKER_HALF_OPEN:
+            self._state = BREAKER_OPEN
+            self._open_until = time.monotonic()
+
+    def _open(self):
+        """Open the circuit for a jittered, exponentially growing period."""
+        self._opened += 1
+        backoff = min(BREAKER_MAX_BACKOFF, BREAKER_BASE_BACKOFF * 2 ** (self._opened - 1))
+        # Połowa okresu stała, połowa losowa - rozprasza powroty wielu sieci
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        self._state = BREAKER_OPEN
+        self._open_until = time.monotonic() + delay
+        _LOGGER.warning("Zbyt wiele błędów dla sieci %s, wstrzymuję zapytania na %.0f s", self._network, delay)
@@ -1,134 +1,466 @@
 """GeckoTerminal sensor platform."""
-import requests
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceEntryType
 import logging
-import async_timeout
+import time
 from datetime import datetime, timedelta
+from homeassistant.util import dt as dt_util
 
-from . import DOMAIN, CONF_NAME, CONF_NETWORK, CONF_POOL_ADDRESS
+from . import DOMAIN, CONF_NAME, CONF_NETWORK, CONF_POOL_ADDRESS, DATA_ENTRY_MANAGERS, entry_pools
+from . import configured_pools
+from . import DATA_SHARED_SENSORS_OWNER
 from . import CONF_SHOW_VOLUME, CONF_DECIMAL_PLACES, CONF_SHOW_FDV, CONF_UPDATE_INTERVAL
-from . import DEFAULT_UPDATE_INTERVAL
+from . import CONF_WARMUP_WINDOW, DEFAULT_UPDATE_INTERVAL, DEFAULT_WARMUP_WINDOW
+from . import CONF_ADAPTIVE_POLLING, CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+from . import CONF_SHOW_STATISTICS, CONF_HISTORY_BACKFILL, CONF_EXTRA_METRICS
+from . import CONF_PRICE_SOURCE, PRICE_SOURCE_POOL, PRICE_SOURCE_TOKEN, CONF_ALERT_RULES
+from . import CONF_STREAM_URL, CONF_HOLDINGS
+from .api import async_get_client
+from .alerts import ALERT_EVENT, AlertEvaluator, parse_alert_rules
+from .cache import async_get_pool_cache
+from .coordinator import async_get_coordinator, phase_offset
+from .history import PriceHistory
+from .snapshot import PoolSnapshot
+from .stream import async_get_stream
+from .portfolio import async_get_portfolio, holding_amount, parse_holdings
+from .ohlcv import OHLCV_SYNC_INTERVAL, OHLCV_SYNC_SPREAD, async_get_ohlcv_store, async_sync_pool_history
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sensory diagnostyczne są odczytywane okresowo; sensory cen aktualizuje koordynator
+SCAN_INTERVAL = timedelta(seconds=60)
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     """Set up GeckoTerminal sensors based on config entry."""
-    _LOGGER.debug(f"Setting up sensor for GeckoTerminal entry. Data: {entry.data}, Options: {entry.options}")
-    
-    # Pobierz dane z konfiguracji
-    name = entry.data[CONF_NAME]
-    network = entry.data[CONF_NETWORK]
-    pool_address = entry.data[CONF_POOL_ADDRESS]
+    _LOGGER.debug("Setting up sensor for GeckoTerminal entry. Data: %s, Options: %s", entry.data, entry.options)
     
     # Pobierz opcje z konfiguracji - najpierw z options, jeśli są, potem z data
     if entry.options:
         config = {**entry.options}
-        _LOGGER.debug(f"Używam opcji z entry.options: {config}")
+        _LOGGER.debug("Używam opcji z entry.options: %s", config)
     else:
         config = {**entry.data}
-        _LOGGER.debug(f"Używam opcji z entry.data: {config}")
+        _LOGGER.debug("Używam opcji z entry.data: %s", config)
     
-    show_volume = config.get(CONF_SHOW_VOLUME, True)
-    decimal_places = config.get(CONF_DECIMAL_PLACES, 2)
-    show_fdv = config.get(CONF_SHOW_FDV, True)
-    update_interval = config.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    # Wpis może śledzić jedną pulę albo całą listę obserwowanych pul
+    manager = GeckoTerminalEntryManager(hass, entry, async_add_entities, config)
+    managers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTRY_MANAGERS, {})
+    managers[entry.entry_id] = manager
+    entry.async_on_unload(manager.async_unload)
     
-    _LOGGER.debug(f"Używam następujących opcji: show_volume={show_volume}, decimal_places={decimal_places}, show_fdv={show_fdv}, update_interval={update_interval}")
+    await manager.async_set_pools(entry_pools(entry))
     
-    # Tworzymy źródło danych, które będzie współdzielone przez wszystkie sensory
-    data_source = GeckoTerminalDataSource(hass, network, pool_address, update_interval)
+    # Statystyki API i portfel są wspólne dla całej integracji - sensory tworzy
+    # pierwszy załadowany wpis, a po jego wyładowaniu przejmuje je kolejny
+    if DATA_SHARED_SENSORS_OWNER not in hass.data[DOMAIN]:
+        manager.async_add_shared_sensors()
+
+def _async_setup_portfolio(hass, async_add_entities):
+    """Add the portfolio sensors once amounts are held, and per-network ones as networks appear.
     
-    entities = []
+    Returns a callable that stops adding them.
+    """
+    portfolio = async_get_portfolio(hass)
+    created = set()
     
-    # Główny sensor ceny z liczbą miejsc po przecinku
-    price_sensor = GeckoTerminalPriceSensor(
-        data_source, 
-        entry.entry_id, 
-        name, 
-        network, 
-        pool_address, 
-        decimal_places
-    )
-    entities.append(price_sensor)
+    def _async_add_sensors():
+        if not portfolio.positions:
+            return
+        entities = []
+        if None not in created:
+            created.add(None)
+            entities.extend(
+                GeckoTerminalPortfolioSensor(portfolio, description) for description in PORTFOLIO_SENSORS
+            )
+        for network in portfolio.networks:
+            if network not in created:
+                created.add(network)
+                entities.extend(
+                    GeckoTerminalPortfolioSensor(portfolio, description, network)
+                    for description in PORTFOLIO_NETWORK_SENSORS
+                )
+        if entities:
+            async_add_entities(entities)
     
-    # Sensor wolumenu 24h, jeśli opcja włączona
-    if show_volume:
-        volume_sensor = GeckoTerminalVolumeSensor(
-            data_source,
-            entry.entry_id,
-            name,
-            network,
-            pool_address
+    _async_add_sensors()
+    return portfolio.register_listener(_async_add_sensors)
+
+class GeckoTerminalTrackedPool:
+    """Runtime state of one pool tracked by a config entry."""
+    
+    def __init__(self, pool, data_source, unsub):
+        """Initialize the tracked pool."""
+        self.pool = pool
+        self.data_source = data_source
+        # Klucz rodzaju sensora ("price", "volume", ... lub klucz metryki) -> encja
+        self.entities = {}
+        self.unsubs = [unsub]
+        self.unsub_backfill = None
+        # Strumień, z którego pula dostaje dane na bieżąco (None - tylko odpytywanie)
+        self.stream = None
+    
+    def async_stop(self):
+        """Stop fetching, streaming and backfilling the pool."""
+        for unsub in self.unsubs:
+            unsub()
+        self.unsubs.clear()
+        if self.stream is not None:
+            self.stream.async_remove_source(self.data_source)
+            self.stream = None
+        if self.unsub_backfill is not None:
+            self.unsub_backfill()
+            self.unsub_backfill = None
+
+class GeckoTerminalEntryManager:
+    """Pools and entities of one config entry: a single pool or a watchlist.
+    
+    Option changes are applied in place: display options re-render the
+    existing entities, polling options retune the data sources and toggled
+    sensors are added or removed. Only the pools whose network or address
+    changed are rebuilt.
+    """
+    
+    def __init__(self, hass, entry, async_add_entities, config):
+        """Initialize the manager."""
+        self.hass = hass
+        self._entry = entry
+        self._async_add_entities = async_add_entities
+        self._config = config
+        # (sieć, adres puli małymi literami) -> GeckoTerminalTrackedPool
+        self._pools = {}
+        # Ustawione, gdy ten wpis udostępnia wspólne sensory API i portfela
+        self._unsub_shared_sensors = None
+    
+    @property
+    def tracked_pools(self):
+        """Return the tracked pools of the entry."""
+        return list(self._pools.values())
+    
+    async def async_update_config(self, config, pools):
+        """Apply changed options and pool list without reloading the entry."""
+        self._config = config
+        decimal_places = config.get(CONF_DECIMAL_PLACES, 2)
+        new_entities = []
+        for tracked in self._pools.values():
+            tracked.data_source.async_set_polling(
+                config.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+                config.get(CONF_ADAPTIVE_POLLING, False),
+                config.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+                config.get(CONF_PRICE_SOURCE, PRICE_SOURCE_POOL),
+            )
+            self._async_update_backfill(tracked)
+            self._async_update_stream(tracked)
+            self._async_update_alerts(tracked)
+            self._async_update_holding(tracked)
+            
+            # Wyłączone sensory znikają, włączone są dodawane do istniejących
+            wanted = self._entity_factories(tracked.pool, tracked.data_source)
+            for kind in [kind for kind in tracked.entities if kind not in wanted]:
+                entity = tracked.entities.pop(kind)
+                if entity.hass is not None:
+                    await entity.async_remove()
+            for kind, factory in wanted.items():
+                if kind not in tracked.entities:
+                    tracked.entities[kind] = factory()
+                    new_entities.append(tracked.entities[kind])
+            
+            for entity in tracked.entities.values():
+                entity.async_set_decimal_places(decimal_places)
+        
+        if new_entities:
+            self._async_add_entities(new_entities)
+        await self.async_set_pools(pools)
+    
+    async def async_set_pools(self, pools):
+        """Track exactly the given pools, adding and removing only the difference."""
+        wanted = {
+            (pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS].lower()): pool for pool in pools
+        }
+        
+        for key in list(self._pools):
+            pool = self._pools[key].pool
+            if key not in wanted:
+                await self._async_remove_pool(key, forget=True)
+            elif wanted[key] != pool:
+                # Zmieniona nazwa - encje są tworzone od nowa, ale zachowują wpisy w rejestrze
+                await self._async_remove_pool(key)
+        
+        added = [pool for key, pool in wanted.items() if key not in self._pools]
+        if not added:
+            return
+        
+        cache = await async_get_pool_cache(self.hass)
+        warmup_window = self._config.get(CONF_WARMUP_WINDOW, DEFAULT_WARMUP_WINDOW)
+        entities = []
+        missing = {}
+        for pool in added:
+            tracked = self._async_add_pool(pool, cache, warmup_window)
+            entities.extend(tracked.entities.values())
+            if tracked.data_source.data is None:
+                missing.setdefault(pool[CONF_NETWORK], []).append(pool[CONF_POOL_ADDRESS])
+        
+        # Bez okna rozgrzewki pule bez danych z pamięci podręcznej są pobierane
+        # przed dodaniem encji - jedną paczką na sieć zamiast osobno dla każdej encji
+        if not warmup_window:
+            for network, addresses in missing.items():
+                await async_get_coordinator(self.hass, network).async_refresh_pools(addresses)
+        
+        # Dodajemy encje dopiero po ich całkowitej inicjalizacji. Przy oknie
+        # rozgrzewki lub danych z pamięci podręcznej encje rejestrują się od razu,
+        # a świeże dane pobierze koordynator w swoim rytmie.
+        self._async_add_entities(entities)
+    
+    def _async_add_pool(self, pool, cache, warmup_window):
+        """Create the data source and entities of one pool."""
+        config = self._config
+        network = pool[CONF_NETWORK]
+        pool_address = pool[CONF_POOL_ADDRESS]
+        update_interval = config.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+        
+        _LOGGER.debug("Dodawanie puli %s (%s) z opcjami: %s", pool_address, network, config)
+        
+        # Tworzymy źródło danych, które będzie współdzielone przez wszystkie sensory puli
+        data_source = GeckoTerminalDataSource(
+            self.hass, network, pool_address, update_interval, cache,
+            config.get(CONF_ADAPTIVE_POLLING, False),
+            config.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+            config.get(CONF_PRICE_SOURCE, PRICE_SOURCE_POOL),
+        )
+        
+        # Przywróć ostatnie znane dane, żeby sensory miały wartość od razu po starcie
+        cached = cache.async_get(network, pool_address)
+        if cached is not None:
+            data_source.restore(*cached)
+        
+        # Pule z tej samej sieci są pobierane razem przez wspólny koordynator.
+        # Pierwsze pobranie jest przesunięte w oknie rozgrzewki o stałą dla
+        # danej puli wartość, żeby przy starcie nie wysyłać serii zapytań.
+        coordinator = async_get_coordinator(self.hass, network)
+        coordinator.async_add_source(data_source, phase_offset(pool_address, warmup_window))
+        tracked = GeckoTerminalTrackedPool(
+            pool, data_source, lambda: coordinator.async_remove_source(data_source)
+        )
+        self._async_update_backfill(tracked)
+        self._async_update_stream(tracked)
+        self._async_update_alerts(tracked)
+        holding_key = (self._entry.entry_id, network, pool_address.lower())
+        tracked.unsubs.append(lambda: async_get_portfolio(self.hass).async_remove_position(holding_key))
+        self._async_update_holding(tracked)
+        
+        tracked.entities = {kind: factory() for kind, factory in self._entity_factories(pool, data_source).items()}
+        self._pools[(network, pool_address.lower())] = tracked
+        return tracked
+    
+    def _async_update_backfill(self, tracked):
+        """Start or stop the OHLCV backfill of a pool to match the options."""
+        enabled = self._config.get(CONF_HISTORY_BACKFILL, False)
+        if not enabled and tracked.unsub_backfill is not None:
+            tracked.unsub_backfill()
+            tracked.unsub_backfill = None
+        if not enabled or tracked.unsub_backfill is not None:
+            return
+        
+        # Uzupełnianie historii ze świec OHLCV - tylko brakujący zakres, raz na godzinę.
+        # Pule zaczynają ze stałym przesunięciem, więc ich zapytania rozkładają się
+        # w czasie zamiast trafiać do kolejki limitu zapytań jednocześnie.
+        data_source = tracked.data_source
+        name = tracked.pool[CONF_NAME]
+        unsubs = []
+        
+        async def _async_backfill(_now=None):
+            await async_sync_pool_history(self.hass, data_source, name)
+        
+        @callback
+        def _async_start(_now):
+            unsubs[:] = [async_track_time_interval(self.hass, _async_backfill, OHLCV_SYNC_INTERVAL)]
+            self._entry.async_create_background_task(
+                self.hass, _async_backfill(),
+                f"{DOMAIN}_backfill_{data_source.network}_{data_source.pool_address}",
+            )
+        
+        def _async_stop():
+            for unsub in unsubs:
+                unsub()
+            unsubs.clear()
+        
+        unsubs.append(async_call_later(
+            self.hass, phase_offset(data_source.pool_address, OHLCV_SYNC_SPREAD), _async_start
+        ))
+        tracked.unsub_backfill = _async_stop
+    
+    def _async_update_stream(self, tracked):
+        """Subscribe the pool to the stream from the options, or unsubscribe it."""
+        url = self._config.get(CONF_STREAM_URL) or None
+        current = tracked.stream.url if tracked.stream is not None else None
+        if url == current:
+            return
+        if tracked.stream is not None:
+            tracked.stream.async_remove_source(tracked.data_source)
+            tracked.stream = None
+        if url is not None:
+            # Odpytywanie REST działa dalej jako zapasowe źródło danych
+            tracked.stream = async_get_stream(self.hass, url)
+            tracked.stream.async_add_source(tracked.data_source)
+    
+    def _async_update_alerts(self, tracked):
+        """Give the pool's data source the alert rules from the options."""
+        rules, _ = parse_alert_rules(self._config.get(CONF_ALERT_RULES, ""))
+        tracked.data_source.async_set_alert_rules(
+            rules, {"entry_id": self._entry.entry_id, "name": tracked.pool[CONF_NAME]}
         )
-        entities.append(volume_sensor)
     
-    # Sensor FDV, jeśli opcja włączona
-    if show_fdv:
-        fdv_sensor = GeckoTerminalFDVSensor(
+    def _async_update_holding(self, tracked):
+        """Give the portfolio the amount of the pool held according to the options."""
+        holdings, _ = parse_holdings(self._config.get(CONF_HOLDINGS, ""))
+        data_source = tracked.data_source
+        async_get_portfolio(self.hass).async_set_position(
+            (self._entry.entry_id, data_source.network, data_source.pool_address.lower()),
             data_source,
-            entry.entry_id,
-            name,
-            network,
-            pool_address
+            holding_amount(holdings, data_source.network, data_source.pool_address),
         )
-        entities.append(fdv_sensor)
     
-    # Dodajemy encje dopiero po ich całkowitej inicjalizacji
-    async_add_entities(entities, True)
-
-def validate_pool_address(network, pool_address):
-    """Validate if the pool address exists for the given network."""
-    url = f"https://api.geckoterminal.com/api/v2/networks/{network}/pools/{pool_address}"
-    _LOGGER.debug(f"Walidacja puli: {url}")
+    def _entity_factories(self, pool, data_source):
+        """Return {sensor kind: factory} of the sensors enabled in the options."""
+        config = self._config
+        entry_id = self._entry.entry_id
+        name = pool[CONF_NAME]
+        network = pool[CONF_NETWORK]
+        pool_address = pool[CONF_POOL_ADDRESS]
+        decimal_places = config.get(CONF_DECIMAL_PLACES, 2)
+        extra_metrics = config.get(CONF_EXTRA_METRICS, [])
+        
+        # Główny sensor ceny z liczbą miejsc po przecinku
+        factories = {
+            "price": lambda: GeckoTerminalPriceSensor(
+                data_source, entry_id, name, network, pool_address, decimal_places
+            ),
+        }
+        
+        # Sensor wolumenu 24h, jeśli opcja włączona
+        if config.get(CONF_SHOW_VOLUME, True):
+            factories["volume"] = lambda: GeckoTerminalVolumeSensor(
+                data_source, entry_id, name, network, pool_address
+            )
+        
+        # Sensor FDV, jeśli opcja włączona
+        if config.get(CONF_SHOW_FDV, True):
+            factories["fdv"] = lambda: GeckoTerminalFDVSensor(
+                data_source, entry_id, name, network, pool_address
+            )
+        
+        # Sensor statystyk z historii cen w pamięci, jeśli opcja włączona
+        if config.get(CONF_SHOW_STATISTICS, False):
+            factories["statistics"] = lambda: GeckoTerminalStatisticsSensor(
+                data_source, entry_id, name, network, pool_address, decimal_places
+            )
+        
+        # Dodatkowe metryki puli wybrane w opcjach
+        for description in METRIC_SENSORS:
+            if description.key in extra_metrics:
+                factories[description.key] = (
+                    lambda description=description: GeckoTerminalMetricSensor(
+                        data_source, entry_id, name, network, pool_address, description
+                    )
+                )
+        
+        # Diagnostyka puli - domyślnie wyłączona w rejestrze encji
+        for description in POOL_DIAGNOSTIC_SENSORS:
+            factories[description.key] = (
+                lambda description=description: GeckoTerminalPoolDiagnosticSensor(
+                    data_source, entry_id, name, network, pool_address, description
+                )
+            )
+        return factories
     
-    try:
-        response = requests.get(url, timeout=10)
-        _LOGGER.debug(f"Status odpowiedzi: {response.status_code}")
+    async def _async_remove_pool(self, key, forget=False):
+        """Stop tracking one pool and remove its entities.
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Sprawdź pełną strukturę odpowiedzi
-            if "data" in data:
-                if "attributes" in data["data"]:
-                    attributes = data["data"]["attributes"]
-                    
-                    # Zapisz wszystkie dostępne atrybuty do logów dla celów diagnostycznych
-                    available_attrs = list(attributes.keys())
-                    _LOGGER.debug(f"Dostępne atrybuty: {available_attrs}")
-                    
-                    if "base_token_price_usd" in attributes:
-                        return True, None
-                    else:
-                        return False, f"Brak atrybutu 'base_token_price_usd' w odpowiedzi API. Dostępne: {available_attrs}"
-                else:
-                    return False, "Brak atrybutów w odpowiedzi API"
-            else:
-                return False, "Nieprawidłowa struktura danych z API - brak klucza 'data'"
-        elif response.status_code == 404:
-            return False, f"Sieć '{network}' lub adres puli '{pool_address}' nie zostały znalezione (404)"
-        else:
-            return False, f"API zwróciło kod statusu {response.status_code}"
-    except Exception as e:
-        return False, f"Błąd: {str(e)}"
-
-def format_price(price_str, decimal_places):
-    """Format price with specified decimal places."""
-    try:
-        # Upewnij się, że price_str jest liczbą zmiennoprzecinkową
-        price_float = float(price_str)
-        # Formatuj cenę z określoną liczbą miejsc po przecinku
-        formatted_price = round(price_float, decimal_places)
-        # Upewnij się, że zawsze wyświetla się dokładnie decimal_places cyfr po przecinku
-        return '{:.{prec}f}'.format(formatted_price, prec=decimal_places)
-    except (ValueError, TypeError):
-        return price_str
+        With forget the entities are also dropped from the entity registry,
+        the entry is detached from the pool's device and cached data is removed
+        unless another entry still tracks the pool.
+        """
+        tracked = self._pools.pop(key)
+        tracked.async_stop()
+        pool = tracked.pool
+        
+        registry = er.async_get(self.hass)
+        for entity in tracked.entities.values():
+            if forget and entity.registry_entry is not None:
+                # Usunięcie z rejestru usuwa też encję z Home Assistant
+                registry.async_remove(entity.entity_id)
+            elif entity.hass is not None:
+                await entity.async_remove()
+        
+        if not forget:
+            return
+        
+        devices = dr.async_get(self.hass)
+        device = devices.async_get_device(
+            identifiers={(DOMAIN, f"{DOMAIN}_{pool[CONF_NETWORK]}_{pool[CONF_POOL_ADDRESS]}")}
+        )
+        if device is not None:
+            devices.async_update_device(device.id, remove_config_entry_id=self._entry.entry_id)
+        
+        if key in configured_pools(self.hass, exclude_entry_id=self._entry.entry_id):
+            # Pamięć podręczną i świece OHLCV nadal wykorzystuje inny wpis
+            _LOGGER.debug("Usunięto pulę %s (%s)", pool[CONF_POOL_ADDRESS], pool[CONF_NETWORK])
+            return
+        
+        cache = await async_get_pool_cache(self.hass)
+        cache.async_remove(pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS])
+        ohlcv_store = await async_get_ohlcv_store(self.hass)
+        ohlcv_store.async_remove(pool[CONF_NETWORK], pool[CONF_POOL_ADDRESS])
+        _LOGGER.debug("Usunięto pulę %s (%s)", pool[CONF_POOL_ADDRESS], pool[CONF_NETWORK])
+    
+    def async_add_shared_sensors(self):
+        """Create the integration-wide API and portfolio sensors in this entry."""
+        self.hass.data[DOMAIN][DATA_SHARED_SENSORS_OWNER] = self._entry.entry_id
+        stats = async_get_client(self.hass).stats
+        self._async_add_entities(
+            [GeckoTerminalApiSensor(stats, description) for description in API_SENSORS]
+        )
+        self._unsub_shared_sensors = _async_setup_portfolio(self.hass, self._async_add_entities)
+    
+    def async_unload(self):
+        """Stop tracking every pool when the entry is unloaded.
+        
+        Shared sensors of this entry are handed over to another loaded entry.
+        """
+        for tracked in self._pools.values():
+            tracked.async_stop()
+        self._pools.clear()
+        domain_data = self.hass.data.get(DOMAIN, {})
+        managers = domain_data.get(DATA_ENTRY_MANAGERS, {})
+        if managers.get(self._entry.entry_id) is self:
+            managers.pop(self._entry.entry_id)
+        
+        if self._unsub_shared_sensors is None:
+            return
+        self._unsub_shared_sensors()
+        self._unsub_shared_sensors = None
+        if domain_data.get(DATA_SHARED_SENSORS_OWNER) == self._entry.entry_id:
+            domain_data.pop(DATA_SHARED_SENSORS_OWNER)
+        # Encje tego wpisu zostały już usunięte - ten sam unikalny ID przejmuje inny wpis
+        successor = next(iter(managers.values()), None)
+        if successor is not None and not self.hass.is_stopping:
+            successor.async_add_shared_sensors()
 
 def format_fdv(fdv_str):
     """Format FDV to more readable format."""
@@ -145,19 +477,266 @@ def format_fdv(fdv_str):
     except (ValueError, TypeError):
         return fdv_str
 
+@dataclass(frozen=True, kw_only=True)
+class GeckoTerminalSensorEntityDescription(SensorEntityDescription):
+    """Description of an opt-in sensor reading one pool metric."""
+    
+    # Przyrostek nazwy i unikalnego ID, zgodnie z pozostałymi sensorami
+    suffix: str
+    # Pola PoolSnapshot, od których zależy wartość
+    fields: tuple[str, ...]
+    value_fn: Callable[[PoolSnapshot], float | int | None]
+    attrs_fn: Callable[[PoolSnapshot], dict] | None = None
+    # Wartości chwilowe (także sumy w oknach kroczących) - HA liczy z nich statystyki długoterminowe
+    state_class: SensorStateClass | None = SensorStateClass.MEASUREMENT
+
+
+def _transactions_description(window, label):
+    """Return the description of the transaction count sensor for a window."""
+    buys = f"buys_{window}"
+    sells = f"sells_{window}"
+    
+    def _total(snapshot):
+        buy_count = getattr(snapshot, buys)
+        sell_count = getattr(snapshot, sells)
+        if buy_count is None and sell_count is None:
+            return None
+        return (buy_count or 0) + (sell_count or 0)
+    
+    return GeckoTerminalSensorEntityDescription(
+        key=f"transactions_{window}",
+        suffix=f" Transakcje {label}",
+        icon="mdi:swap-horizontal",
+        fields=(buys, sells),
+        value_fn=_total,
+        attrs_fn=lambda snapshot: {"buys": getattr(snapshot, buys), "sells": getattr(snapshot, sells)},
+    )
+
+
+def _volume_description(window, label):
+    """Return the description of the volume sensor for a window."""
+    field = f"volume_usd_{window}"
+    return GeckoTerminalSensorEntityDescription(
+        key=f"volume_{window}",
+        suffix=f" Wolumen {label}",
+        icon="mdi:chart-line",
+        native_unit_of_measurement="USD",
+        fields=(field,),
+        value_fn=lambda snapshot: getattr(snapshot, field),
+    )
+
+
+# Metryki dostępne w odpowiedzi API, włączane pojedynczo w opcjach
+METRIC_SENSORS = (
+    GeckoTerminalSensorEntityDescription(
+        key="reserve_usd",
+        suffix=" Płynność",
+        icon="mdi:water",
+        native_unit_of_measurement="USD",
+        fields=("reserve_usd",),
+        value_fn=lambda snapshot: snapshot.reserve_usd,
+    ),
+    GeckoTerminalSensorEntityDescription(
+        key="market_cap_usd",
+        suffix=" Kapitalizacja",
+        icon="mdi:finance",
+        native_unit_of_measurement="USD",
+        fields=("market_cap_usd",),
+        value_fn=lambda snapshot: snapshot.market_cap_usd,
+    ),
+    GeckoTerminalSensorEntityDescription(
+        key="quote_price_usd",
+        suffix=" Cena tokenu kwotowanego",
+        icon="mdi:currency-usd",
+        native_unit_of_measurement="USD",
+        fields=("quote_price_usd",),
+        value_fn=lambda snapshot: snapshot.quote_price_usd,
+    ),
+    _volume_description("m5", "5m"),
+    _volume_description("h1", "1h"),
+    _volume_description("h6", "6h"),
+    _transactions_description("m5", "5m"),
+    _transactions_description("h1", "1h"),
+    _transactions_description("h6", "6h"),
+    _transactions_description("h24", "24h"),
+)
+
+@dataclass(frozen=True, kw_only=True)
+class GeckoTerminalDiagnosticEntityDescription(SensorEntityDescription):
+    """Description of a diagnostic sensor."""
+    
+    suffix: str
+    # Dla sensorów API: GeckoTerminalRequestStats, dla sensorów puli: źródło danych
+    value_fn: Callable[[object], object]
+    attrs_fn: Callable[[object], dict] | None = None
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+
+
+# Statystyki zapytań do API, łącznie i (w atrybutach) dla każdej sieci
+API_SENSORS = (
+    GeckoTerminalDiagnosticEntityDescription(
+        key="requests",
+        suffix=" Zapytania",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.requests,
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="rate_limited",
+        suffix=" Odpowiedzi 429",
+        icon="mdi:speedometer-slow",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.rate_limited,
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="latency_p50",
+        suffix=" Opóźnienie p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.latency(0.5),
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="latency_p95",
+        suffix=" Opóźnienie p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.latency(0.95),
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="payload_bytes",
+        suffix=" Pobrane dane",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.payload_bytes,
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="cache_hit_ratio",
+        suffix=" Trafienia pamięci podręcznej",
+        icon="mdi:cached",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.cache_hit_ratio,
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="last_success",
+        suffix=" Ostatnia udana odpowiedź",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda stats: stats.last_success,
+    ),
+)
+
+# Diagnostyka pojedynczej puli
+POOL_DIAGNOSTIC_SENSORS = (
+    GeckoTerminalDiagnosticEntityDescription(
+        key="poll_interval",
+        suffix=" Interwał odpytywania",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data_source: round(data_source.update_interval),
+        attrs_fn=lambda data_source: {
+            "price_interval": round(data_source.price_interval),
+            "volatility": data_source.volatility,
+            "adaptive": data_source.adaptive,
+        },
+    ),
+    GeckoTerminalDiagnosticEntityDescription(
+        key="last_update",
+        suffix=" Ostatnia aktualizacja",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data_source: data_source.fetched_at,
+    ),
+)
+
+@dataclass(frozen=True, kw_only=True)
+class GeckoTerminalPortfolioEntityDescription(SensorEntityDescription):
+    """Description of a portfolio sensor."""
+    
+    suffix: str
+    # (portfel, sieć albo None dla całości) -> wartość
+    value_fn: Callable[[object, str | None], object]
+
+
+# Sumy całego portfela
+PORTFOLIO_SENSORS = (
+    GeckoTerminalPortfolioEntityDescription(
+        key="value",
+        suffix=" Wartość",
+        icon="mdi:wallet",
+        native_unit_of_measurement="USD",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda portfolio, network: portfolio.value,
+    ),
+    GeckoTerminalPortfolioEntityDescription(
+        key="change_h24",
+        suffix=" Zmiana 24h",
+        icon="mdi:chart-line",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda portfolio, network: portfolio.change_h24,
+    ),
+)
+
+# Wartość portfela w jednej sieci
+PORTFOLIO_NETWORK_SENSORS = (
+    GeckoTerminalPortfolioEntityDescription(
+        key="value",
+        suffix=" Wartość",
+        icon="mdi:wallet-outline",
+        native_unit_of_measurement="USD",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda portfolio, network: portfolio.network_value(network),
+    ),
+)
+
+# Zmienność (%/min), przy której pula jest odpytywana z ustawioną częstotliwością
+VOLATILITY_TARGET = 0.5
+VOLATILITY_SMOOTHING = 0.3
+
 class GeckoTerminalDataSource:
     """Data source for GeckoTerminal sensors."""
     
-    def __init__(self, hass, network, pool_address, update_interval):
+    def __init__(
+        self, hass, network, pool_address, update_interval, cache=None,
+        adaptive=False, max_update_interval=DEFAULT_MAX_UPDATE_INTERVAL,
+        price_source=PRICE_SOURCE_POOL,
+    ):
         """Initialize the data source."""
         self.hass = hass
         self._network = network
         self._pool_address = pool_address
         self._update_interval = update_interval
+        self._adaptive = adaptive
+        self._max_update_interval = max(update_interval, max_update_interval)
+        # Wykładniczo wygładzona zmienność ceny w %/min (tryb adaptacyjny)
+        self._volatility = None
+        self._last_price = None
+        self._last_price_time = None
+        self._effective_interval = update_interval
+        self._price_source = price_source
+        self._base_token_address = None
+        self._token_price = None
+        self._history = PriceHistory()
+        self._cache = cache
         self._data = None
+        self._snapshot = None
         self._last_update = None
+        self._fetched_at = None
+        self._stale = False
         self._available = True
         self._listeners = []
+        self._coordinator = None
+        # True, gdy dane puli przychodzą ze strumienia - odpytywanie jest wtedy zapasowe
+        self._streaming = False
+        self._alerts = None
+        self._alert_context = {}
     
     @property
     def available(self):
@@ -169,87 +748,327 @@ class GeckoTerminalDataSource:
         """Return the data."""
         return self._data
     
+    @property
+    def snapshot(self):
+        """Return the parsed snapshot of the current data."""
+        return self._snapshot
+    
+    @property
+    def stale(self):
+        """Return True if the data was restored from cache and not yet refreshed."""
+        return self._stale
+    
+    @property
+    def fetched_at(self):
+        """Return when the current data was fetched from the API (UTC)."""
+        return self._fetched_at
+    
+    @property
+    def network(self):
+        """Return the network of the pool."""
+        return self._network
+    
+    @property
+    def pool_address(self):
+        """Return the pool address."""
+        return self._pool_address
+    
+    @property
+    def history(self):
+        """Return the in-memory price history of the pool."""
+        return self._history
+    
+    @property
+    def adaptive(self):
+        """Return True if the update interval adapts to price volatility."""
+        return self._adaptive
+    
+    @property
+    def volatility(self):
+        """Return the smoothed price volatility in percent per minute."""
+        return self._volatility
+    
+    @property
+    def token_mode(self):
+        """Return True if the price comes from the shared token-price endpoint."""
+        return self._price_source == PRICE_SOURCE_TOKEN
+    
+    @property
+    def base_token_address(self):
+        """Return the address of the pool's base token, once known."""
+        return self._base_token_address
+    
+    @property
+    def price_interval(self):
+        """Return how often the price should be refreshed, in seconds."""
+        return self._effective_interval
+    
+    @property
+    def streaming(self):
+        """Return True while the pool receives pushed data from a stream."""
+        return self._streaming
+    
+    @property
+    def update_interval(self):
+        """Return the effective pool update interval in seconds."""
+        if self._streaming:
+            # Strumień dostarcza dane na bieżąco, odpytywanie tylko je uzupełnia
+            return self._max_update_interval
+        if self.token_mode and self._base_token_address:
+            # Cena przychodzi z endpointu tokenów, pozostałe dane puli
+            # zmieniają się wolniej i są odświeżane rzadziej
+            return self._max_update_interval
+        return self._effective_interval
+    
     @property
     def scan_interval(self):
         """Return the scan interval."""
-        return timedelta(seconds=self._update_interval)
+        return timedelta(seconds=self._effective_interval)
     
-    def register_listener(self, listener):
-        """Register a listener."""
-        self._listeners.append(listener)
+    def attach(self, coordinator):
+        """Attach the network coordinator that fetches data for this source."""
+        self._coordinator = coordinator
     
-    async def async_update(self):
-        """Fetch new state data for all sensors."""
-        _LOGGER.debug(f"Aktualizacja danych GeckoTerminal dla sieci: {self._network}, puli: {self._pool_address}")
+    def async_set_polling(self, update_interval, adaptive, max_update_interval, price_source):
+        """Apply new polling options in place, keeping the current data."""
+        self._update_interval = update_interval
+        self._adaptive = adaptive
+        self._max_update_interval = max(update_interval, max_update_interval)
+        if adaptive:
+            self._effective_interval = min(
+                self._max_update_interval, max(update_interval, self._effective_interval)
+            )
+        else:
+            self._volatility = None
+            self._effective_interval = update_interval
+        
+        if price_source != self._price_source:
+            self._price_source = price_source
+            self._token_price = None
+            if not self.token_mode and self._data is not None and self._available:
+                # Wróć do ceny z puli zamiast ostatniej ceny tokenu
+                previous = self._snapshot
+                self._snapshot = PoolSnapshot.from_attributes(self._data, self._fetched_at)
+                self._notify_listeners(previous)
+        
+        if self._coordinator is not None:
+            self._coordinator.async_reschedule(self)
+    
+    def async_set_streaming(self, streaming):
+        """Switch REST polling between the normal and the fallback interval."""
+        if streaming == self._streaming:
+            return
+        self._streaming = streaming
+        if self._coordinator is not None:
+            self._coordinator.async_reschedule(self)
+    
+    def async_set_alert_rules(self, rules, context=None):
+        """Set the alert rules of this pool; context is added to every event."""
+        rules = tuple(rule for rule in rules if rule.applies_to(self._network, self._pool_address))
+        if self._alerts is None or self._alerts.rules != rules:
+            # Niezmienione reguły zachowują swój stan (np. już zgłoszony ruch ceny)
+            self._alerts = AlertEvaluator(rules) if rules else None
+        self._alert_context = context or {}
+    
+    def restore(self, attributes, fetched_at):
+        """Restore last known attributes from the persistent cache."""
+        self._data = attributes
+        self._snapshot = PoolSnapshot.from_attributes(attributes, fetched_at)
+        self._fetched_at = fetched_at
+        self._stale = True
+    
+    def register_listener(self, listener, fields=None):
+        """Register a listener and return a callable that unregisters it.
+        
+        fields is an iterable of PoolSnapshot field names the listener
+        depends on. Such a listener is only called when one of those values
+        changes; without fields it is called on every data update.
+        """
+        entry = (listener, tuple(fields) if fields is not None else None)
+        self._listeners.append(entry)
         
+        def _remove_listener():
+            if entry in self._listeners:
+                self._listeners.remove(entry)
+        
+        return _remove_listener
+    
+    async def async_update(self):
+        """Request an immediate refresh through the network coordinator."""
         # Sprawdź, czy minął czas od ostatniej aktualizacji
         now = datetime.now()
         if (self._last_update is not None and 
             (now - self._last_update) < timedelta(seconds=self._update_interval)):
-            _LOGGER.debug("Pomijam aktualizację, zbyt krótki czas od ostatniej aktualizacji")
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Pomijam aktualizację puli %s, zbyt krótki czas od ostatniej aktualizacji", self._pool_address)
             return
         
-        url = f"https://api.geckoterminal.com/api/v2/networks/{self._network}/pools/{self._pool_address}"
-        try:
-            async with async_timeout.timeout(10):
-                response = await self.hass.async_add_executor_job(
-                    self._fetch_data, url
-                )
-                
-            if not response:
-                _LOGGER.error("Brak odpowiedzi z GeckoTerminal API")
-                self._available = False
-                self._notify_listeners()
-                return
-                
+        if self._coordinator is not None:
+            await self._coordinator.async_refresh_pools([self._pool_address])
+    
+    def async_set_data(self, attributes, base_token_address=None):
+        """Store attributes fetched by the coordinator and notify listeners."""
+        if base_token_address:
+            self._base_token_address = base_token_address
+        if self.token_mode and self._token_price is None and self._coordinator is not None and self._base_token_address:
+            # Cena tokenu mogła już zostać pobrana dla innej puli
+            self._token_price = self._coordinator.async_token_price(self._base_token_address)
+        if self._available and attributes == self._data:
+            # Nic się nie zmieniło - nie ma potrzeby zapisywać stanu encji
+            self.async_mark_fresh()
+            return
+        # Po zmianie dostępności lub po danych z pamięci podręcznej
+        # wszystkie encje muszą zapisać stan
+        previous = self._snapshot if self._available and not self._stale else None
+        self._data = attributes
+        self._last_update = datetime.now()
+        self._available = True
+        self._stale = False
+        self._store_fetched()
+        self._snapshot = PoolSnapshot.from_attributes(attributes, self._fetched_at)
+        if self.token_mode and self._token_price is not None:
+            self._snapshot = replace(self._snapshot, price_usd=self._token_price)
+        self._record_sample()
+        self._evaluate_alerts()
+        self._update_volatility()
+        self._notify_listeners(previous)
+    
+    def async_mark_fresh(self):
+        """Record that the current data was confirmed by the API unchanged."""
+        self._last_update = datetime.now()
+        self._store_fetched()
+        self._record_sample()
+        self._update_volatility()
+        if not self._available or self._stale:
             self._available = True
-            
-            if "data" in response and "attributes" in response["data"]:
-                self._data = response["data"]["attributes"]
-                self._last_update = now
-                _LOGGER.debug(f"Dane zaktualizowane pomyślnie, dostępne atrybuty: {list(self._data.keys())}")
-            else:
-                _LOGGER.error(f"Nieprawidłowa struktura danych z API GeckoTerminal: brak data lub attributes")
-                self._available = False
-            
-            self._notify_listeners()
-                
-        except Exception as e:
-            _LOGGER.error(f"Błąd pobierania danych z GeckoTerminal: {e}")
-            self._available = False
+            self._stale = False
             self._notify_listeners()
-
-    def _fetch_data(self, url):
-        """Fetch data from API."""
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            _LOGGER.error(f"Błąd pobierania danych: {e}")
-            return None
     
-    def _notify_listeners(self):
-        """Notify all listeners about a data update."""
-        for listener in self._listeners:
+    def async_set_token_price(self, price):
+        """Apply the shared base token price fetched by the coordinator."""
+        self._token_price = price
+        snapshot = self._snapshot
+        if snapshot is None or not self._available or snapshot.price_usd == price:
+            return
+        self._snapshot = replace(snapshot, price_usd=price, fetched_at=dt_util.utcnow())
+        self._record_sample()
+        self._evaluate_alerts()
+        self._update_volatility()
+        self._notify_listeners(snapshot)
+    
+    def _record_sample(self):
+        """Append the current price and 5-minute volume to the history."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.price_usd is None:
+            return
+        self._history.append(time.time(), snapshot.price_usd, snapshot.volume_usd_m5 or 0.0)
+    
+    def _evaluate_alerts(self):
+        """Evaluate the alert rules against the new snapshot and fire events."""
+        if not self._alerts:
+            return
+        snapshot = self._snapshot
+        for rule, details in self._alerts.evaluate(snapshot, self._history, time.time()):
+            self.hass.bus.async_fire(
+                ALERT_EVENT,
+                {
+                    **self._alert_context,
+                    "network": self._network,
+                    "pool_address": self._pool_address,
+                    "rule": rule.text,
+                    "type": rule.kind,
+                    "threshold": rule.threshold,
+                    "window": rule.window,
+                    "price": snapshot.price_usd,
+                    **details,
+                },
+            )
+    
+    def _update_volatility(self):
+        """Update the volatility estimate and the adaptive update interval."""
+        snapshot = self._snapshot
+        if not self._adaptive or snapshot is None or snapshot.price_usd is None:
+            return
+        
+        price = snapshot.price_usd
+        now = time.monotonic()
+        
+        sample = None
+        if self._last_price and now > self._last_price_time:
+            minutes = (now - self._last_price_time) / 60
+            sample = abs(price - self._last_price) / self._last_price * 100 / minutes
+        self._last_price = price
+        self._last_price_time = now
+        
+        # Zmiana z ostatnich 5 minut zgłaszana przez API pomaga wychwycić
+        # ruchy, które zaszły pomiędzy naszymi odpytaniami
+        if snapshot.price_change_m5 is not None:
+            sample = max(sample or 0.0, abs(snapshot.price_change_m5) / 5)
+        if sample is None:
+            return
+        
+        if self._volatility is None:
+            self._volatility = sample
+        else:
+            self._volatility += VOLATILITY_SMOOTHING * (sample - self._volatility)
+        
+        # Przy zmienności równej progowi (lub wyższej) odpytujemy z ustawioną
+        # częstotliwością, spokojniejsze pule zwalniają aż do górnej granicy
+        if self._volatility <= 0:
+            interval = self._max_update_interval
+        else:
+            interval = self._update_interval * VOLATILITY_TARGET / self._volatility
+        self._effective_interval = min(
+            self._max_update_interval, max(self._update_interval, interval)
+        )
+    
+    def _store_fetched(self):
+        """Record the fetch time and persist the data in the cache."""
+        self._fetched_at = dt_util.utcnow()
+        if self._cache is not None and self._data is not None:
+            self._cache.async_set(self._network, self._pool_address, self._data, self._fetched_at)
+    
+    def async_set_unavailable(self):
+        """Mark the data source as unavailable and notify listeners."""
+        if not self._available:
+            return
+        self._available = False
+        self._notify_listeners()
+    
+    def _notify_listeners(self, previous=None):
+        """Notify listeners whose snapshot fields changed since previous.
+        
+        Without a previous snapshot every listener is notified.
+        """
+        current = self._snapshot
+        for listener, fields in list(self._listeners):
+            if (previous is not None and fields is not None and all(
+                getattr(previous, field) == getattr(current, field) for field in fields
+            )):
+                continue
             try:
                 listener()
             except Exception as e:
-                _LOGGER.error(f"Błąd podczas powiadamiania słuchacza: {e}")
+                _LOGGER.error("Błąd podczas powiadamiania słuchacza: %s", e)
 
 class GeckoTerminalBaseSensor(SensorEntity):
     """Base class for GeckoTerminal sensors."""
     
+    # Pola PoolSnapshot, od których zależy stan sensora
+    _snapshot_fields = None
+    # Liczba miejsc po przecinku (tylko sensory, które ją wykorzystują)
+    _decimal_places = None
+    # Atrybuty zmieniające się przy każdej aktualizacji nie trafiają do bazy rejestratora
+    _unrecorded_attributes = frozenset({"last_updated", "stale", "data_age"})
+    
     def __init__(self, data_source, entry_id, name, network, pool_address, suffix=""):
         """Initialize the sensor."""
         super().__init__()
         self._data_source = data_source
-        self.hass = data_source.hass
         self._entry_id = entry_id
         self._name = f"{name}{suffix}"
         self._network = network
         self._pool_address = pool_address
-        self._state = None
         self._attrs = {}
         
         # Unikalny ID dla sensora
@@ -265,8 +1084,22 @@ class GeckoTerminalBaseSensor(SensorEntity):
             "via_device": (DOMAIN, network),
         }
         
-        # Zarejestruj sensor jako słuchacza aktualizacji danych
-        data_source.register_listener(self._handle_data_update)
+        # Dane są dostarczane przez koordynator sieci, HA nie musi odpytywać encji
+        self._attr_should_poll = False
+        
+        # Wartości z danych przywróconych z pamięci podręcznej
+        if data_source.snapshot is not None:
+            self._apply_snapshot(data_source.snapshot)
+    
+    async def async_added_to_hass(self):
+        """Register for data updates once the entity is added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._data_source.register_listener(self._handle_data_update, self._snapshot_fields)
+        )
+        # Dane mogły zostać pobrane przed rejestracją (update_before_add)
+        if self._data_source.snapshot is not None:
+            self._apply_snapshot(self._data_source.snapshot)
     
     @property
     def name(self):
@@ -283,19 +1116,44 @@ class GeckoTerminalBaseSensor(SensorEntity):
         """Return the scan interval for this entity."""
         return self._data_source.scan_interval
     
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return self._attrs
+    def _apply_snapshot(self, snapshot):
+        """Compute the state and the final attributes once per data update."""
+        self._update_from_snapshot(snapshot)
+        attrs = self._attrs
+        if self._data_source.stale and self._data_source.fetched_at is not None:
+            # Wiek danych z pamięci podręcznej w chwili ich przywrócenia
+            age = (dt_util.utcnow() - self._data_source.fetched_at).total_seconds()
+            attrs = {**attrs, "stale": True, "data_age": int(age)}
+        self._attr_extra_state_attributes = attrs
+    
+    def _update_from_snapshot(self, snapshot):
+        """Compute the state and attributes from a new snapshot."""
+        raise NotImplementedError
+    
+    def async_set_decimal_places(self, decimal_places):
+        """Re-render the state with a new number of decimal places."""
+        if self._decimal_places is None or decimal_places == self._decimal_places:
+            return
+        self._decimal_places = decimal_places
+        self._attr_suggested_display_precision = decimal_places
+        if self.registry_entry is not None:
+            # HA zapisuje sugerowaną precyzję w rejestrze tylko przy dodaniu encji
+            sensor_options = dict(self.registry_entry.options.get(SENSOR_DOMAIN, {}))
+            sensor_options["suggested_display_precision"] = decimal_places
+            er.async_get(self.hass).async_update_entity_options(
+                self.entity_id, SENSOR_DOMAIN, sensor_options
+            )
+        if self.hass is not None:
+            self._handle_data_update()
     
     def _handle_data_update(self):
         """Handle data update from the data source."""
         try:
-            # Sprawdź, czy hass jest dostępny przed wywołaniem async_write_ha_state
-            if hasattr(self, 'hass') and self.hass is not None:
-                self.async_write_ha_state()
+            if self._data_source.snapshot is not None:
+                self._apply_snapshot(self._data_source.snapshot)
+            self.async_write_ha_state()
         except Exception as e:
-            _LOGGER.error(f"Błąd podczas aktualizacji stanu encji: {e}")
+            _LOGGER.error("Błąd podczas aktualizacji stanu encji: %s", e)
     
     async def async_update(self):
         """Fetch new state data for the sensor."""
@@ -304,104 +1162,286 @@ class GeckoTerminalBaseSensor(SensorEntity):
 class GeckoTerminalPriceSensor(GeckoTerminalBaseSensor):
     """Representation of a GeckoTerminal price sensor."""
     
+    _snapshot_fields = (
+        "price_usd",
+        "base_token_symbol",
+        "quote_token_symbol",
+        "name",
+        "price_change_m5",
+        "price_change_h1",
+        "price_change_h6",
+        "price_change_h24",
+    )
+    _unrecorded_attributes = GeckoTerminalBaseSensor._unrecorded_attributes | frozenset({
+        "price_change_m5",
+        "price_change_h1",
+        "price_change_h6",
+        "price_change_h24",
+    })
+    
     def __init__(self, data_source, entry_id, name, network, pool_address, decimal_places):
         """Initialize the sensor."""
-        super().__init__(data_source, entry_id, name, network, pool_address)
         self._decimal_places = decimal_places
+        super().__init__(data_source, entry_id, name, network, pool_address)
         self._attr_native_unit_of_measurement = "USD"
+        # Cena jest liczbą - liczba miejsc po przecinku to tylko sposób wyświetlania.
+        # Klasa "monetary" dopuszcza wyłącznie state_class "total", a cena jest
+        # wartością chwilową, więc sensor ma tylko state_class "measurement".
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = decimal_places
     
     @property
     def icon(self):
         """Return the icon to use in the frontend."""
         return "mdi:currency-usd"
     
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if self._data_source.data is None:
-            return None
-        
-        price = self._data_source.data.get("base_token_price_usd")
-        if price is None:
-            return None
-        
-        # Pobierz podstawowe informacje
-        base_token_symbol = self._data_source.data.get("base_token_symbol", "")
-        quote_token_symbol = self._data_source.data.get("quote_token_symbol", "")
+    def _update_from_snapshot(self, snapshot):
+        """Compute the numeric price and attributes once per update."""
+        if snapshot.price_usd is None:
+            self._attr_native_value = None
+            self._attrs = {}
+            return
         
-        # Dodaj podstawowe atrybuty
-        self._attrs["base_token_symbol"] = base_token_symbol
-        self._attrs["quote_token_symbol"] = quote_token_symbol
-        self._attrs["pool_name"] = self._data_source.data.get("name", f"{base_token_symbol}/{quote_token_symbol}")
-        self._attrs["pool_address"] = self._pool_address
-        self._attrs["decimal_places"] = self._decimal_places
+        # Podstawowe atrybuty
+        base_token_symbol = snapshot.base_token_symbol or ""
+        quote_token_symbol = snapshot.quote_token_symbol or ""
+        attrs = {
+            "base_token_symbol": base_token_symbol,
+            "quote_token_symbol": quote_token_symbol,
+            "pool_name": snapshot.name or f"{base_token_symbol}/{quote_token_symbol}",
+            "pool_address": self._pool_address,
+            "decimal_places": self._decimal_places,
+        }
         
-        # Dodaj zmianę ceny, jeśli dostępna
-        if "price_change_percentage" in self._data_source.data:
-            price_changes = self._data_source.data["price_change_percentage"]
-            for period, value in price_changes.items():
-                self._attrs[f"price_change_{period}"] = f"{value}%"
+        # Zmiana ceny, jeśli dostępna
+        for period, value in snapshot.price_changes():
+            attrs[f"price_change_{period}"] = f"{value}%"
         
-        # Dodaj informację o czasie ostatniej aktualizacji
-        self._attrs["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Czas pobrania danych z API, a nie zapisu stanu
+        if snapshot.fetched_at is not None:
+            attrs["last_updated"] = snapshot.fetched_at.isoformat()
+        self._attrs = attrs
         
-        # Formatuj cenę z określoną liczbą miejsc po przecinku
-        try:
-            return format_price(price, self._decimal_places)
-        except Exception as e:
-            _LOGGER.error(f"Błąd formatowania ceny: {e}")
-            return price
+        self._attr_native_value = snapshot.price_usd
 
 class GeckoTerminalVolumeSensor(GeckoTerminalBaseSensor):
     """Representation of a GeckoTerminal volume sensor."""
     
+    _snapshot_fields = ("volume_usd_h24",)
+    
     def __init__(self, data_source, entry_id, name, network, pool_address):
         """Initialize the sensor."""
         super().__init__(data_source, entry_id, name, network, pool_address, " Wolumen 24h")
         self._attr_native_unit_of_measurement = "USD"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 2
     
     @property
     def icon(self):
         """Return the icon to use in the frontend."""
         return "mdi:chart-line"
     
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if self._data_source.data is None:
-            return None
-        
-        # Pobierz wolumen 24h
-        if "volume_usd" in self._data_source.data and "h24" in self._data_source.data["volume_usd"]:
-            volume_24h = self._data_source.data["volume_usd"]["h24"]
-            self._attrs["formatted_volume"] = format_fdv(volume_24h)
-            return float(volume_24h)
-        
-        return None
+    def _update_from_snapshot(self, snapshot):
+        """Take the 24h volume from the snapshot."""
+        volume_24h = snapshot.volume_usd_h24
+        self._attr_native_value = volume_24h
+        self._attrs = {"formatted_volume": format_fdv(volume_24h)} if volume_24h is not None else {}
 
 class GeckoTerminalFDVSensor(GeckoTerminalBaseSensor):
     """Representation of a GeckoTerminal FDV sensor."""
     
+    _snapshot_fields = ("fdv_usd",)
+    
     def __init__(self, data_source, entry_id, name, network, pool_address):
         """Initialize the sensor."""
         super().__init__(data_source, entry_id, name, network, pool_address, " FDV")
         self._attr_native_unit_of_measurement = "USD"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 2
     
     @property
     def icon(self):
         """Return the icon to use in the frontend."""
         return "mdi:cash-multiple"
     
+    def _update_from_snapshot(self, snapshot):
+        """Take the FDV from the snapshot."""
+        fdv = snapshot.fdv_usd
+        self._attr_native_value = fdv
+        self._attrs = {"formatted_fdv": format_fdv(fdv)} if fdv is not None else {}
+
+class GeckoTerminalStatisticsSensor(GeckoTerminalBaseSensor):
+    """Rolling price statistics computed from the in-memory history."""
+    
+    _snapshot_fields = ("price_usd", "volume_usd_m5")
+    # Statystyki okien zmieniają się przy każdej próbce - stan (VWAP) wystarczy w historii
+    _unrecorded_attributes = GeckoTerminalBaseSensor._unrecorded_attributes | frozenset(
+        f"{key}_{window}"
+        for window in ("1h", "24h")
+        for key in ("min", "max", "mean", "vwap", "open", "high", "low", "close")
+    ) | frozenset({"samples_24h"})
+    
+    def __init__(self, data_source, entry_id, name, network, pool_address, decimal_places):
+        """Initialize the sensor."""
+        self._decimal_places = decimal_places
+        super().__init__(data_source, entry_id, name, network, pool_address, " Statystyki 24h")
+        self._attr_native_unit_of_measurement = "USD"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = decimal_places
+    
     @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if self._data_source.data is None:
-            return None
+    def icon(self):
+        """Return the icon to use in the frontend."""
+        return "mdi:chart-box-outline"
+    
+    def _update_from_snapshot(self, snapshot):
+        """Compute the 24h VWAP (or mean price when no volume was sampled)."""
+        now = time.time()
+        history = self._data_source.history
+        stats_24h = history.stats(86400, now)
+        if stats_24h is None:
+            self._attr_native_value = None
+            return
+        stats_1h = history.stats(3600, now)
         
-        # Pobierz FDV
-        if "fdv_usd" in self._data_source.data:
-            fdv = self._data_source.data["fdv_usd"]
-            self._attrs["formatted_fdv"] = format_fdv(fdv)
-            return float(fdv)
+        attrs = {}
+        for window, stats in (("1h", stats_1h), ("24h", stats_24h)):
+            for key in ("min", "max", "mean", "vwap", "open", "high", "low", "close"):
+                value = stats.get(key) if stats else None
+                attrs[f"{key}_{window}"] = (
+                    round(value, self._decimal_places + 6) if value is not None else None
+                )
+        attrs["samples_24h"] = stats_24h["samples"]
+        self._attrs = attrs
         
-        return None
\ No newline at end of file
+        value = stats_24h["vwap"] if stats_24h["vwap"] is not None else stats_24h["mean"]
+        self._attr_native_value = round(value, self._decimal_places + 6)
+
+class GeckoTerminalMetricSensor(GeckoTerminalBaseSensor):
+    """Sensor generated from a GeckoTerminalSensorEntityDescription."""
+    
+    entity_description: GeckoTerminalSensorEntityDescription
+    
+    def __init__(self, data_source, entry_id, name, network, pool_address, description):
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._snapshot_fields = description.fields
+        super().__init__(data_source, entry_id, name, network, pool_address, description.suffix)
+    
+    def _update_from_snapshot(self, snapshot):
+        """Read the described metric from the snapshot."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(snapshot)
+        if description.attrs_fn is not None:
+            self._attrs = description.attrs_fn(snapshot)
+
+class GeckoTerminalPoolDiagnosticSensor(GeckoTerminalBaseSensor):
+    """Diagnostic value of a pool's data source, refreshed periodically."""
+    
+    entity_description: GeckoTerminalDiagnosticEntityDescription
+    _unrecorded_attributes = GeckoTerminalBaseSensor._unrecorded_attributes | frozenset(
+        {"price_interval", "volatility"}
+    )
+    
+    def __init__(self, data_source, entry_id, name, network, pool_address, description):
+        """Initialize the sensor."""
+        self.entity_description = description
+        super().__init__(data_source, entry_id, name, network, pool_address, description.suffix)
+        # Wartość zmienia się także bez nowych danych (np. potwierdzenie 304)
+        self._attr_should_poll = True
+    
+    def _update_from_snapshot(self, snapshot):
+        """Read the described value from the data source."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(self._data_source)
+        if description.attrs_fn is not None:
+            self._attrs = description.attrs_fn(self._data_source)
+    
+    async def async_update(self):
+        """Re-read the value without requesting new pool data."""
+        self._apply_snapshot(self._data_source.snapshot)
+
+class GeckoTerminalApiSensor(SensorEntity):
+    """Integration-wide API request statistic with a per-network breakdown."""
+    
+    entity_description: GeckoTerminalDiagnosticEntityDescription
+    
+    def __init__(self, stats, description):
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._stats = stats
+        self._attr_name = f"GeckoTerminal API{description.suffix}"
+        self._attr_unique_id = f"{DOMAIN}_api_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "api")},
+            "name": "GeckoTerminal API",
+            "manufacturer": "GeckoTerminal",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+        self._attr_should_poll = True
+        self._update_from_stats()
+    
+    def _update_from_stats(self):
+        """Compute the total value and the per-network attributes."""
+        value_fn = self.entity_description.value_fn
+        self._attr_native_value = value_fn(self._stats.total)
+        attrs = {}
+        for network, stats in self._stats.networks.items():
+            value = value_fn(stats)
+            attrs[network] = value.isoformat() if isinstance(value, datetime) else value
+        self._attr_extra_state_attributes = attrs
+    
+    async def async_update(self):
+        """Read the current statistics."""
+        self._update_from_stats()
+
+class GeckoTerminalPortfolioSensor(SensorEntity):
+    """Portfolio total, for all held pools or those on one network."""
+    
+    entity_description: GeckoTerminalPortfolioEntityDescription
+    _unrecorded_attributes = frozenset({"change_h24"})
+    
+    def __init__(self, portfolio, description, network=None):
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._portfolio = portfolio
+        self._network = network
+        scope = f"_{network}" if network is not None else ""
+        self._attr_name = f"GeckoTerminal Portfolio{f' {network}' if network else ''}{description.suffix}"
+        self._attr_unique_id = f"{DOMAIN}_portfolio{scope}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "portfolio")},
+            "name": "GeckoTerminal Portfolio",
+            "manufacturer": "GeckoTerminal",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+        # Sumy aktualizuje portfel, gdy zmieni się cena którejś z pozycji
+        self._attr_should_poll = False
+        self._update_from_portfolio()
+    
+    async def async_added_to_hass(self):
+        """Register for portfolio updates once the entity is added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._portfolio.register_listener(self._handle_portfolio_update, self._network)
+        )
+        self._update_from_portfolio()
+    
+    def _update_from_portfolio(self):
+        """Read the current totals."""
+        portfolio = self._portfolio
+        value = self.entity_description.value_fn(portfolio, self._network)
+        self._attr_native_value = round(value, 8) if value is not None else None
+        if self._network is None:
+            self._attr_extra_state_attributes = {"positions": portfolio.positions}
+        else:
+            change = portfolio.network_change_h24(self._network)
+            self._attr_extra_state_attributes = {
+                "positions": portfolio.network_positions(self._network),
+                "change_h24": round(change, 4) if change is not None else None,
+            }
+    
+    def _handle_portfolio_update(self):
+        """Write the new totals."""
+        self._update_from_portfolio()
+        self.async_write_ha_state()
@@ -0,0 +1,107 @@
+"""Parsed, immutable view of a GeckoTerminal pool payload."""
+from dataclasses import dataclass
+from datetime import datetime
+
+# Okna czasowe zmian ceny i wolumenu zwracane przez API
+WINDOWS = ("m5", "h1", "h6", "h24")
+
+
+def _to_float(value):
+    """Convert an API value (usually a decimal string) to float, or None."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _window_floats(values):
+    """Return the float values of a per-window mapping, in WINDOWS order."""
+    if not isinstance(values, dict):
+        return (None,) * len(WINDOWS)
+    return tuple(_to_float(values.get(window)) for window in WINDOWS)
+
+
+def _to_int(value):
+    """Convert an API counter to int, or None."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _transactions(values):
+    """Return (buys, sells) tuples per window from the transactions mapping."""
+    if not isinstance(values, dict):
+        empty = (None,) * len(WINDOWS)
+        return empty, empty
+    windows = [values.get(window) if isinstance(values.get(window), dict) else {} for window in WINDOWS]
+    return (
+        tuple(_to_int(counts.get("buys")) for counts in windows),
+        tuple(_to_int(counts.get("sells")) for counts in windows),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class PoolSnapshot:
+    """Pool attributes converted once per fetch, shared by all entities."""
+
+    name: str | None
+    address: str | None
+    base_token_symbol: str | None
+    quote_token_symbol: str | None
+    price_usd: float | None
+    quote_price_usd: float | None
+    price_change_m5: float | None
+    price_change_h1: float | None
+    price_change_h6: float | None
+    price_change_h24: float | None
+    volume_usd_m5: float | None
+    volume_usd_h1: float | None
+    volume_usd_h6: float | None
+    volume_usd_h24: float | None
+    fdv_usd: float | None
+    market_cap_usd: float | None
+    reserve_usd: float | None
+    buys_m5: int | None
+    buys_h1: int | None
+    buys_h6: int | None
+    buys_h24: int | None
+    sells_m5: int | None
+    sells_h1: int | None
+    sells_h6: int | None
+    sells_h24: int | None
+    fetched_at: datetime | None
+
+    @classmethod
+    def from_attributes(cls, attributes, fetched_at=None):
+        """Parse the attributes object of a pool returned by the API."""
+        price_changes = _window_floats(attributes.get("price_change_percentage"))
+        volumes = _window_floats(attributes.get("volume_usd"))
+        buys, sells = _transactions(attributes.get("transactions"))
+        return cls(
+            attributes.get("name"),
+            attributes.get("address"),
+            attributes.get("base_token_symbol"),
+            attributes.get("quote_token_symbol"),
+            _to_float(attributes.get("base_token_price_usd")),
+            _to_float(attributes.get("quote_token_price_usd")),
+            *price_changes,
+            *volumes,
+            _to_float(attributes.get("fdv_usd")),
+            _to_float(attributes.get("market_cap_usd")),
+            _to_float(attributes.get("reserve_in_usd")),
+            *buys,
+            *sells,
+            fetched_at,
+        )
+
+    def price_changes(self):
+        """Return (window, percent) pairs of the available price changes."""
+        values = (self.price_change_m5, self.price_change_h1, self.price_change_h6, self.price_change_h24)
+        return tuple(
+            (window, value) for window, value in zip(WINDOWS, values) if value is not None
+        )
@@ -0,0 +1,136 @@
+"""Request statistics of the GeckoTerminal API client."""
+import time
+from collections import deque
+
+from homeassistant.util import dt as dt_util
+
+# Liczba ostatnich pomiarów czasu odpowiedzi używanych do percentyli
+LATENCY_SAMPLES = 500
+# Liczba ostatnich próbek trybu śledzenia dołączanych do diagnostyki
+TRACE_SAMPLES = 200
+
+
+class GeckoTerminalRequestStats:
+    """Counters and latency samples of the requests to one network (or all)."""
+
+    __slots__ = (
+        "requests",
+        "rate_limited",
+        "errors",
+        "not_modified",
+        "cache_hits",
+        "payload_bytes",
+        "last_success",
+        "_latencies",
+    )
+
+    def __init__(self):
+        """Initialize the statistics."""
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        # Odpowiedzi 304 lub o treści identycznej z poprzednią
+        self.not_modified = 0
+        # Odpowiedzi podane z krótkotrwałej pamięci podręcznej, bez zapytania
+        self.cache_hits = 0
+        self.payload_bytes = 0
+        self.last_success = None
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, latency, status, size=0, not_modified=False):
+        """Record one request sent to the API."""
+        self.requests += 1
+        self._latencies.append(latency)
+        self.payload_bytes += size
+        if status == 429:
+            self.rate_limited += 1
+        elif status in (200, 304):
+            self.last_success = dt_util.utcnow()
+            if not_modified:
+                self.not_modified += 1
+        else:
+            self.errors += 1
+
+    def latency(self, quantile):
+        """Return the latency quantile in milliseconds, or None without samples."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return round(ordered[index] * 1000, 1)
+
+    @property
+    def cache_hit_ratio(self):
+        """Return the percentage of requests answered without a new payload."""
+        total = self.requests + self.cache_hits
+        if not total:
+            return None
+        return round((self.not_modified + self.cache_hits) / total * 100, 1)
+
+    def as_dict(self):
+        """Return the statistics as a plain dict."""
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "errors": self.errors,
+            "not_modified": self.not_modified,
+            "cache_hits": self.cache_hits,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "payload_bytes": self.payload_bytes,
+            "latency_p50_ms": self.latency(0.5),
+            "latency_p95_ms": self.latency(0.95),
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
+
+
+class GeckoTerminalStats:
+    """Request statistics per network and for the whole integration."""
+
+    def __init__(self):
+        """Initialize the statistics."""
+        self.total = GeckoTerminalRequestStats()
+        self.networks = {}
+        # Próbki trybu śledzenia jako krotki - formatowane dopiero w diagnostyce
+        self.traces = deque(maxlen=TRACE_SAMPLES)
+
+    def _targets(self, network):
+        """Return the statistics objects a request to network counts towards."""
+        if network is None:
+            return (self.total,)
+        stats = self.networks.get(network)
+        if stats is None:
+            stats = self.networks[network] = GeckoTerminalRequestStats()
+        return (self.total, stats)
+
+    def record_request(self, network, latency, status, size=0, not_modified=False):
+        """Record one request sent to the API."""
+        for stats in self._targets(network):
+            stats.record(latency, status, size, not_modified)
+
+    def record_cache_hit(self, network):
+        """Record a response served from the short-lived response cache."""
+        for stats in self._targets(network):
+            stats.cache_hits += 1
+
+    def record_trace(self, network, path, latency, status, size, not_modified):
+        """Keep one sampled request of the trace mode."""
+        self.traces.append((time.time(), network, path, latency, status, size, not_modified))
+
+    def as_dict(self):
+        """Return all statistics as a plain dict."""
+        return {
+            "total": self.total.as_dict(),
+            "networks": {network: stats.as_dict() for network, stats in self.networks.items()},
+            "traces": [
+                {
+                    "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                    "network": network,
+                    "path": path,
+                    "latency_ms": round(latency * 1000, 1),
+                    "status": status,
+                    "bytes": size,
+                    "not_modified": not_modified,
+                }
+                for timestamp, network, path, latency, status, size, not_modified in self.traces
+            ],
+        }
@@ -0,0 +1,324 @@
+"""Streaming transport feeding GeckoTerminal data sources from a relay.
+
+GeckoTerminal has no public push API, so the stream comes from a relay run
+locally (or any stand-in) at a configured URL:
+
+- ws:// or wss:// - a WebSocket. The client sends
+  {"type": "subscribe", "pools": [{"network": ..., "address": ...}]} and
+  {"type": "unsubscribe", "pools": [...]} as pools are added and removed.
+- http:// or https:// - Server-Sent Events, requested as
+  GET {url}?pools=network/address,...; the request is reopened when the
+  set of pools changes.
+
+Every message (a WebSocket text frame or an SSE "data:" event) is a JSON
+object {"network": ..., "data": pool or [pools]}, where pools have the
+shape of the REST API (attributes and relationships). A relay can
+therefore forward /pools/multi responses as they are.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import timedelta
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from . import DATA_STREAMS, DOMAIN
+from .api import async_get_client
+from .transport import GeckoTerminalTransport, base_token_address, pool_items
+
+_LOGGER = logging.getLogger(__name__)
+
+# Ponowne łączenie z rosnącym odstępem
+RECONNECT_MIN_DELAY = 5  # sekundy
+RECONNECT_MAX_DELAY = 300  # sekundy
+# Brak jakichkolwiek danych przez ten czas oznacza zerwane połączenie
+STREAM_READ_TIMEOUT = 120  # sekundy
+WEBSOCKET_HEARTBEAT = 30  # sekundy
+# Pula bez wiadomości przez ten czas wraca do zwykłego odpytywania, nawet
+# gdy połączenie trwa (przekaźnik jej nie obsługuje albo przestał ją wysyłać)
+POOL_STALE_AFTER = 120  # sekundy
+STALE_CHECK_INTERVAL = timedelta(seconds=30)
+
+
+@callback
+def async_get_stream(hass: HomeAssistant, url):
+    """Return the shared streaming transport for a relay URL."""
+    streams = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_STREAMS, {})
+    stream = streams.get(url)
+    if stream is None:
+        stream = streams[url] = GeckoTerminalStreamTransport(hass, url)
+    return stream
+
+
+def _pool_key(network, pool_address):
+    """Return the subscription key of a pool."""
+    return (network, pool_address.lower())
+
+
+class GeckoTerminalStreamTransport(GeckoTerminalTransport):
+    """Push pool data from a WebSocket or SSE relay into data sources."""
+
+    def __init__(self, hass: HomeAssistant, url):
+        """Initialize the transport."""
+        self.hass = hass
+        self._url = url
+        self._websocket = url.startswith(("ws://", "wss://"))
+        # (sieć, adres małymi literami) -> lista źródeł danych
+        self._sources = {}
+        # (sieć, adres małymi literami) -> czas (monotoniczny) ostatniej wiadomości
+        self._last_message = {}
+        self._task = None
+        self._unsub_stale_check = None
+        self._connection = None
+        self._connected = False
+        self._messages = 0
+        # Zmiana subskrypcji SSE wymaga ponownego otwarcia strumienia
+        self._resubscribe = asyncio.Event()
+
+    @property
+    def url(self):
+        """Return the relay URL."""
+        return self._url
+
+    @property
+    def connected(self):
+        """Return True while the stream is connected."""
+        return self._connected
+
+    @property
+    def pool_count(self):
+        """Return the number of subscribed pools."""
+        return len(self._sources)
+
+    @property
+    def streaming_pool_count(self):
+        """Return the number of pools that recently received streamed data."""
+        return len(self._last_message)
+
+    @property
+    def messages(self):
+        """Return the number of messages received."""
+        return self._messages
+
+    @callback
+    def async_add_source(self, source, delay=0):
+        """Subscribe a data source's pool."""
+        key = _pool_key(source.network, source.pool_address)
+        new = key not in self._sources
+        self._sources.setdefault(key, []).append(source)
+        # Pula przechodzi na strumień dopiero po pierwszej wiadomości z jej danymi
+        source.async_set_streaming(key in self._last_message)
+        if self._unsub_stale_check is None:
+            self._unsub_stale_check = async_track_time_interval(
+                self.hass, self._async_check_stale, STALE_CHECK_INTERVAL
+            )
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN}_stream_{self._url}"
+            )
+        elif new:
+            self._async_subscription_changed("subscribe", [self._pool(source)])
+
+    @callback
+    def async_remove_source(self, source):
+        """Unsubscribe a data source and stop the stream when idle."""
+        key = _pool_key(source.network, source.pool_address)
+        sources = self._sources.get(key, [])
+        if source in sources:
+            sources.remove(source)
+            source.async_set_streaming(False)
+        if not sources and key in self._sources:
+            self._sources.pop(key)
+            self._last_message.pop(key, None)
+            self._async_subscription_changed("unsubscribe", [self._pool(source)])
+
+        if self._sources:
+            return
+        if self._unsub_stale_check is not None:
+            self._unsub_stale_check()
+            self._unsub_stale_check = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        streams = self.hass.data.get(DOMAIN, {}).get(DATA_STREAMS, {})
+        if streams.get(self._url) is self:
+            streams.pop(self._url)
+
+    @staticmethod
+    def _pool(source):
+        """Return the subscription entry of a data source's pool."""
+        # Adres w oryginalnej postaci - w części sieci (np. Solana) wielkość liter ma znaczenie
+        return {"network": source.network, "address": source.pool_address}
+
+    def _subscriptions(self):
+        """Return the subscription entries of every subscribed pool."""
+        return [self._pool(sources[0]) for sources in self._sources.values()]
+
+    @callback
+    def _async_subscription_changed(self, action, pools):
+        """Tell the relay about added or removed pools."""
+        if not self._connected:
+            return
+        if not self._websocket:
+            self._resubscribe.set()
+            return
+        self.hass.async_create_task(self._async_send({"type": action, "pools": pools}))
+
+    async def _async_send(self, message):
+        """Send a message over the WebSocket, ignoring a closing connection."""
+        connection = self._connection
+        if connection is None or connection.closed:
+            return
+        try:
+            await connection.send_json(message)
+        except (aiohttp.ClientError, ConnectionError) as e:
+            _LOGGER.debug("Nie udało się wysłać subskrypcji do %s: %s", self._url, e)
+
+    async def _async_run(self):
+        """Keep the stream connected, reconnecting with a growing delay."""
+        delay = RECONNECT_MIN_DELAY
+        try:
+            while self._sources:
+                try:
+                    if self._websocket:
+                        await self._async_run_websocket()
+                    elif await self._async_run_sse():
+                        # Zmiana subskrypcji SSE - od razu otwórz strumień na nowo
+                        continue
+                    delay = RECONNECT_MIN_DELAY
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:  # pylint: disable=broad-except
+                    # Każdy błąd połączenia (także WebSocketError czy
+                    # ConnectionResetError) kończy się ponownym łączeniem
+                    _LOGGER.warning(
+                        "Strumień GeckoTerminal %s niedostępny (%s), ponowna próba za %d s",
+                        self._url, e or type(e).__name__, delay,
+                    )
+                self._async_set_connected(False)
+                if not self._sources:
+                    break
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        finally:
+            self._async_set_connected(False)
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _async_run_websocket(self):
+        """Read one WebSocket connection until it closes."""
+        session = async_get_client(self.hass).session
+        async with session.ws_connect(
+            self._url, heartbeat=WEBSOCKET_HEARTBEAT, receive_timeout=STREAM_READ_TIMEOUT
+        ) as connection:
+            self._connection = connection
+            try:
+                await connection.send_json({"type": "subscribe", "pools": self._subscriptions()})
+                self._async_set_connected(True)
+                async for message in connection:
+                    if message.type == aiohttp.WSMsgType.TEXT:
+                        self._async_handle_message(message.data)
+                    elif message.type == aiohttp.WSMsgType.ERROR:
+                        raise connection.exception() or aiohttp.ClientError("WebSocket error")
+            finally:
+                self._connection = None
+
+    async def _async_run_sse(self):
+        """Read one Server-Sent Events response.
+
+        Returns True when the response was closed because the subscribed
+        pools changed, False when the relay ended it.
+        """
+        session = async_get_client(self.hass).session
+        pools = ",".join(f"{pool['network']}/{pool['address']}" for pool in self._subscriptions())
+        self._resubscribe.clear()
+        async with session.get(
+            self._url,
+            params={"pools": pools},
+            headers={"Accept": "text/event-stream"},
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=STREAM_READ_TIMEOUT),
+        ) as response:
+            response.raise_for_status()
+            self._async_set_connected(True)
+            reader = asyncio.ensure_future(self._async_read_sse(response))
+            resubscribe = asyncio.ensure_future(self._resubscribe.wait())
+            try:
+                await asyncio.wait((reader, resubscribe), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                reader.cancel()
+                resubscribe.cancel()
+            if reader.done() and not reader.cancelled():
+                # Zgłasza błąd odczytu, jeśli wystąpił
+                reader.result()
+                return False
+            return True
+
+    async def _async_read_sse(self, response):
+        """Dispatch the events of a Server-Sent Events response until it ends."""
+        data = []
+        async for line in response.content:
+            line = line.decode("utf-8").rstrip("\r\n")
+            if line.startswith("data:"):
+                data.append(line[5:].lstrip())
+            elif not line and data:
+                # Pusta linia kończy zdarzenie
+                self._async_handle_message("\n".join(data))
+                data = []
+
+    @callback
+    def _async_set_connected(self, connected):
+        """Update the connection state; a lost connection hands every pool back to polling."""
+        if connected == self._connected:
+            return
+        self._connected = connected
+        _LOGGER.info(
+            "Strumień GeckoTerminal %s %s", self._url,
+            "połączony" if connected else "rozłączony, odpytywanie przejmuje aktualizacje",
+        )
+        if not connected:
+            self._async_stop_streaming(list(self._last_message))
+
+    @callback
+    def _async_check_stale(self, _now=None):
+        """Hand pools without recent messages back to polling."""
+        limit = time.monotonic() - POOL_STALE_AFTER
+        stale = [key for key, received in self._last_message.items() if received < limit]
+        if stale:
+            _LOGGER.debug("Strumień %s nie dostarcza danych %d pul", self._url, len(stale))
+            self._async_stop_streaming(stale)
+
+    @callback
+    def _async_stop_streaming(self, keys):
+        """Switch the data sources of the given pools back to normal polling."""
+        for key in keys:
+            self._last_message.pop(key, None)
+            for source in self._sources.get(key, []):
+                source.async_set_streaming(False)
+
+    @callback
+    def _async_handle_message(self, text):
+        """Apply one streamed message to the subscribed data sources."""
+        try:
+            message = json.loads(text)
+        except ValueError:
+            _LOGGER.debug("Nieprawidłowa wiadomość strumienia %s", self._url)
+            return
+        network = message.get("network") if isinstance(message, dict) else None
+        if not network:
+            return
+        self._messages += 1
+        now = time.monotonic()
+        for item in pool_items(message):
+            attributes = item["attributes"]
+            key = _pool_key(network, attributes["address"])
+            sources = self._sources.get(key)
+            if not sources:
+                continue
+            self._last_message[key] = now
+            token_address = base_token_address(item, network)
+            for source in list(sources):
+                source.async_set_streaming(True)
+                source.async_set_data(attributes, token_address)
@@ -0,0 +1,48 @@
+"""Transports delivering GeckoTerminal pool data to the data sources."""
+
+
+def base_token_address(item, network):
+    """Return the base token address from a pool's relationships, or None."""
+    try:
+        token_id = item["relationships"]["base_token"]["data"]["id"]
+    except (KeyError, TypeError):
+        return None
+    # Identyfikator ma postać "{sieć}_{adres}"
+    prefix = f"{network}_"
+    if token_id.startswith(prefix):
+        return token_id[len(prefix):]
+    return token_id.rpartition("_")[2] or None
+
+
+def pool_items(payload):
+    """Return the pool objects of an API-shaped payload ("data" object or list)."""
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        return []
+    return [
+        item for item in data
+        if isinstance(item, dict)
+        and isinstance(item.get("attributes"), dict)
+        and item["attributes"].get("address")
+    ]
+
+
+class GeckoTerminalTransport:
+    """Delivers pool data to data sources.
+
+    A transport tracks data sources with async_add_source and pushes data
+    into them through their async_set_data, async_mark_fresh and
+    async_set_unavailable methods. REST polling (the per-network
+    coordinator) is always present; a streaming transport can be added on
+    top of it for pools that need lower latency.
+    """
+
+    def async_add_source(self, source, delay=0):
+        """Start delivering data to a data source."""
+        raise NotImplementedError
+
+    def async_remove_source(self, source):
+        """Stop delivering data to a data source."""
+        raise NotImplementedError
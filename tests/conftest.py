@@ -0,0 +1,6 @@
+"""Shared fixtures of the GeckoTerminal tests."""
+import sys
+from pathlib import Path
+
+# Testy importują integrację jako pakiet custom_components.geckoterminal
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,83 @@
+"""Tests of the alert rule parser and evaluator."""
+from types import SimpleNamespace
+
+from custom_components.geckoterminal.alerts import (
+    ALERT_ABOVE,
+    ALERT_RISE,
+    AlertEvaluator,
+    parse_alert_rules,
+)
+from custom_components.geckoterminal.history import PriceHistory
+
+
+def _snapshot(price, m5=None):
+    """Return a snapshot with a price and a 5-minute change."""
+    return SimpleNamespace(
+        price_usd=price,
+        price_change_m5=m5,
+        price_change_h1=None,
+        price_change_h6=None,
+        price_change_h24=None,
+    )
+
+
+def test_parse_alert_rules():
+    rules, invalid = parse_alert_rules(
+        "# komentarz\n"
+        "above 1.5\n"
+        "ETH/0xABC rise 5 5m\n"
+        "drop 0 1h\n"
+        "change 5 5x\n"
+        "below\n"
+    )
+
+    assert [(rule.kind, rule.threshold, rule.window, rule.target) for rule in rules] == [
+        (ALERT_ABOVE, 1.5, None, None),
+        (ALERT_RISE, 5.0, 300, ("eth", "0xabc")),
+    ]
+    assert invalid == ["drop 0 1h", "change 5 5x", "below"]
+
+
+def test_parse_alert_rules_rejects_empty_target():
+    rules, invalid = parse_alert_rules("/0xabc above 1\neth/ above 1\n")
+
+    assert rules == []
+    assert invalid == ["/0xabc above 1", "eth/ above 1"]
+
+
+def test_crossing_fires_once_and_rearms():
+    rules, _ = parse_alert_rules("above 10")
+    evaluator = AlertEvaluator(rules)
+
+    assert evaluator.evaluate(_snapshot(9), None, 0) == []
+    assert len(evaluator.evaluate(_snapshot(11), None, 1)) == 1
+    assert evaluator.evaluate(_snapshot(12), None, 2) == []
+    assert evaluator.evaluate(_snapshot(9), None, 3) == []
+    assert len(evaluator.evaluate(_snapshot(11), None, 4)) == 1
+
+
+def test_rise_is_not_hidden_by_a_larger_api_drop():
+    history = PriceHistory(size=10, resolution=1)
+    history.append(0, 100.0)
+    rules, _ = parse_alert_rules("rise 5 5m")
+    evaluator = AlertEvaluator(rules)
+
+    # Historia: +10%, API: -20% - wzrost nadal spełnia regułę
+    fired = evaluator.evaluate(_snapshot(110.0, m5=-20.0), history, 300)
+
+    assert len(fired) == 1
+    assert fired[0][1]["change_percent"] == 10.0
+    assert fired[0][1]["reference_price"] == 100.0
+
+
+def test_drop_uses_the_api_change_between_polls():
+    rules, _ = parse_alert_rules("drop 5 5m")
+    evaluator = AlertEvaluator(rules)
+
+    fired = evaluator.evaluate(_snapshot(90.0, m5=-10.0), None, 0)
+
+    assert len(fired) == 1
+    assert fired[0][1]["change_percent"] == -10.0
+    assert evaluator.evaluate(_snapshot(90.0, m5=-12.0), None, 1) == []
+    assert evaluator.evaluate(_snapshot(90.0, m5=1.0), None, 2) == []
+    assert len(evaluator.evaluate(_snapshot(90.0, m5=-6.0), None, 3)) == 1
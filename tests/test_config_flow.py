@@ -0,0 +1,77 @@
+"""Tests of the config flow helpers."""
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.geckoterminal import config_flow
+from custom_components.geckoterminal.config_flow import parse_watchlist
+
+
+def test_validation_times_out_as_cannot_connect(monkeypatch):
+    async def _slow_lookup(hass, pools):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(config_flow, "async_lookup_pools", _slow_lookup)
+    monkeypatch.setattr(config_flow, "FLOW_REQUEST_TIMEOUT", 0.01)
+    pools, _ = parse_watchlist("eth/0xabc")
+
+    errors, missing, found = asyncio.run(
+        config_flow._async_validate_pools(SimpleNamespace(data={}), pools)
+    )
+
+    assert errors == {"base": "cannot_connect"}
+    assert missing == []
+    assert found == {}
+
+
+def test_network_list_times_out_as_empty(monkeypatch):
+    async def _slow_networks(hass):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(config_flow, "async_get_networks", _slow_networks)
+    monkeypatch.setattr(config_flow, "FLOW_REQUEST_TIMEOUT", 0.01)
+
+    assert asyncio.run(config_flow._async_networks(SimpleNamespace(data={}))) == []
+
+
+def _hass_with_entries(*entries):
+    """Return a hass stand-in whose config entries are the given (entry_id, data) pairs."""
+    config_entries = [
+        SimpleNamespace(entry_id=entry_id, data=data, options={}) for entry_id, data in entries
+    ]
+    return SimpleNamespace(
+        data={},
+        config_entries=SimpleNamespace(async_entries=lambda domain: config_entries),
+    )
+
+
+def test_watchlist_rejects_pools_of_other_entries(monkeypatch):
+    async def _lookup(hass, pools):
+        raise AssertionError("pools tracked elsewhere must not be looked up")
+
+    monkeypatch.setattr(config_flow, "async_lookup_pools", _lookup)
+    hass = _hass_with_entries(
+        ("single", {"name": "A", "network": "eth", "pool_address": "0xABC"}),
+    )
+    pools, _ = parse_watchlist("eth/0xabc\nbsc/0xdef")
+
+    errors, placeholders, found = asyncio.run(config_flow._async_check_watchlist(hass, pools))
+
+    assert errors == {"pools": "pools_already_configured"}
+    assert placeholders == {"pools": "eth/0xabc"}
+    assert found == {}
+
+
+def test_watchlist_may_keep_its_own_pools(monkeypatch):
+    async def _lookup(hass, pools):
+        return {("eth", "0xabc"): {"name": "A"}}
+
+    monkeypatch.setattr(config_flow, "async_lookup_pools", _lookup)
+    hass = _hass_with_entries(
+        ("watchlist", {"name": "W", "pools": [{"name": "A", "network": "eth", "pool_address": "0xabc"}]}),
+    )
+    pools, _ = parse_watchlist("eth/0xabc")
+
+    errors, _, found = asyncio.run(config_flow._async_check_watchlist(hass, pools, "watchlist"))
+
+    assert errors == {}
+    assert ("eth", "0xabc") in found
@@ -0,0 +1,127 @@
+"""Tests of the per-network coordinator fan-out."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.geckoterminal import coordinator as coordinator_module
+from custom_components.geckoterminal.api import NOT_MODIFIED
+from custom_components.geckoterminal.coordinator import GeckoTerminalNetworkCoordinator
+
+
+class _FakeClient:
+    """API client returning queued responses and recording requested paths."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.paths = []
+        self.scheduler = SimpleNamespace(backlog=0, paused_for=0.0)
+
+    async def async_get_json(self, path, params=None, conditional=False, cache_ttl=None, network=None):
+        self.paths.append(path)
+        return self.responses.pop(0)
+
+
+class _FakeSource:
+    """Data source recording what the coordinator pushed into it."""
+
+    def __init__(self, pool_address, network="solana"):
+        self.network = network
+        self.pool_address = pool_address
+        self.update_interval = 30
+        self.price_interval = 30
+        self.adaptive = False
+        self.token_mode = False
+        self.base_token_address = None
+        self.available = True
+        self.data = []
+        self.fresh = 0
+
+    def attach(self, coordinator):
+        self.coordinator = coordinator
+
+    def async_set_data(self, attributes, base_token_address=None):
+        self.available = True
+        self.data.append((attributes, base_token_address))
+
+    def async_mark_fresh(self):
+        self.available = True
+        self.fresh += 1
+
+    def async_set_unavailable(self):
+        self.available = False
+
+
+def _pool(address, token="TokenAddr"):
+    """Return a pool object shaped like the multi-pool endpoint's."""
+    return {
+        "id": f"solana_{address}",
+        "attributes": {"address": address, "base_token_price_usd": "1.5"},
+        "relationships": {"base_token": {"data": {"id": f"solana_{token}"}}},
+    }
+
+
+@pytest.fixture
+def coordinator(monkeypatch):
+    """Return a coordinator on a stub Home Assistant with a fake client."""
+    monkeypatch.setattr(coordinator_module, "async_track_time_interval", lambda *args: lambda: None)
+    hass = SimpleNamespace(data={})
+    coordinator = GeckoTerminalNetworkCoordinator(hass, "solana")
+    return coordinator
+
+
+def test_multi_pool_response_reaches_sources(coordinator):
+    first = _FakeSource("PoolOne")
+    second = _FakeSource("PoolTwo")
+    coordinator._client = _FakeClient({"data": [_pool("PoolOne"), _pool("PoolTwo", "Other")]})
+    coordinator.async_add_source(first)
+    coordinator.async_add_source(second)
+
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne", "PoolTwo"]))
+
+    # Adresy trafiają do URL w oryginalnej postaci (Solana rozróżnia wielkość liter)
+    assert coordinator._client.paths == ["/networks/solana/pools/multi/PoolOne,PoolTwo"]
+    assert first.data == [(_pool("PoolOne")["attributes"], "TokenAddr")]
+    assert second.data == [(_pool("PoolTwo")["attributes"], "Other")]
+
+
+def test_pool_missing_from_response_is_unavailable(coordinator):
+    present = _FakeSource("PoolOne")
+    missing = _FakeSource("PoolTwo")
+    coordinator._client = _FakeClient({"data": [_pool("PoolOne")]})
+    coordinator.async_add_source(present)
+    coordinator.async_add_source(missing)
+
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne", "PoolTwo"]))
+
+    assert present.available and present.data
+    assert not missing.available
+
+
+def test_unchanged_response_keeps_missing_pool_unavailable(coordinator):
+    present = _FakeSource("PoolOne")
+    missing = _FakeSource("PoolTwo")
+    coordinator._client = _FakeClient(
+        {"data": [_pool("PoolOne")]}, NOT_MODIFIED, {"data": [_pool("PoolOne"), _pool("PoolTwo")]}
+    )
+    coordinator.async_add_source(present)
+    coordinator.async_add_source(missing)
+
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne", "PoolTwo"]))
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne", "PoolTwo"]))
+    # Ta sama treść bez puli nie może przywrócić jej dostępności
+    assert present.fresh == 1
+    assert not missing.available and missing.fresh == 0
+
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne", "PoolTwo"]))
+    assert missing.available and missing.data
+
+
+def test_unchanged_invalid_response_keeps_pools_unavailable(coordinator):
+    source = _FakeSource("PoolOne")
+    coordinator._client = _FakeClient([], NOT_MODIFIED)
+    coordinator.async_add_source(source)
+
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne"]))
+    asyncio.run(coordinator.async_refresh_pools(["PoolOne"]))
+    assert not source.available and source.fresh == 0
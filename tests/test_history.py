@@ -0,0 +1,59 @@
+"""Tests of the in-memory price history."""
+from custom_components.geckoterminal.history import PriceHistory
+
+
+def test_fast_polls_share_a_slot_but_history_advances():
+    history = PriceHistory(size=10, resolution=30)
+    for timestamp in range(0, 100, 10):
+        history.append(timestamp, float(timestamp))
+
+    # Przedziały 0-29, 30-59, 60-89 i 90-99 - po jednej próbce na każdy
+    assert len(history) == 4
+    assert history.last_time == 90
+    assert history.price_at(29) == 20.0
+    assert history.price_at(59) == 50.0
+
+
+def test_older_samples_are_ignored():
+    history = PriceHistory(size=10, resolution=30)
+    history.append(100, 1.0)
+    history.append(50, 2.0)
+
+    assert len(history) == 1
+    assert history.price_at(100) == 1.0
+
+
+def test_ring_buffer_keeps_newest_samples():
+    history = PriceHistory(size=3, resolution=1)
+    for timestamp in range(5):
+        history.append(timestamp, float(timestamp))
+
+    assert len(history) == 3
+    assert history.price_at(1) is None
+    assert history.price_at(2) == 2.0
+
+
+def test_stats():
+    history = PriceHistory(size=10, resolution=1)
+    history.append(0, 1.0, 1.0)
+    history.append(1, 3.0, 3.0)
+    history.append(2, 2.0, 0.0)
+
+    stats = history.stats(window=10, now=2)
+    assert stats["open"] == 1.0
+    assert stats["close"] == 2.0
+    assert stats["min"] == 1.0
+    assert stats["max"] == 3.0
+    assert stats["mean"] == 2.0
+    assert stats["vwap"] == 2.5
+    assert stats["samples"] == 3
+    assert history.stats(window=10, now=100) is None
+
+
+def test_seed_only_fills_an_empty_history():
+    history = PriceHistory(size=10, resolution=1)
+    history.seed([(0, 1.0, 0.0), (1, 2.0, 0.0)])
+    history.seed([(5, 9.0, 0.0)])
+
+    assert len(history) == 2
+    assert history.last_time == 1
@@ -0,0 +1,76 @@
+"""Tests of the held amounts parser and the portfolio totals."""
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.geckoterminal.portfolio import (
+    GeckoTerminalPortfolio,
+    holding_amount,
+    parse_holdings,
+)
+
+
+class _FakeSource:
+    """Data source stand-in with a snapshot and field listeners."""
+
+    def __init__(self, network, price, change_h24=None):
+        self.network = network
+        self.snapshot = SimpleNamespace(price_usd=price, price_change_h24=change_h24)
+        self.listeners = []
+
+    def register_listener(self, listener, fields):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    def set_price(self, price, change_h24=None):
+        self.snapshot = SimpleNamespace(price_usd=price, price_change_h24=change_h24)
+        for listener in list(self.listeners):
+            listener()
+
+
+def test_parse_holdings():
+    holdings, invalid = parse_holdings("# komentarz\n2,5\nETH/0xABC 10\nbsc/0xdef -1\n1 2\n")
+
+    assert holdings == {None: 2.5, ("eth", "0xabc"): 10.0}
+    assert invalid == ["bsc/0xdef -1", "1 2"]
+    assert holding_amount(holdings, "eth", "0xAbC") == 10.0
+    assert holding_amount(holdings, "bsc", "0xdef") == 2.5
+
+
+def test_parse_holdings_rejects_empty_target():
+    holdings, invalid = parse_holdings("/0xabc 1\neth/ 1\n")
+
+    assert holdings == {}
+    assert invalid == ["/0xabc 1", "eth/ 1"]
+
+
+def test_totals_follow_price_updates():
+    async def _run():
+        hass = SimpleNamespace(data={}, loop=asyncio.get_running_loop())
+        portfolio = GeckoTerminalPortfolio(hass)
+        calls = []
+        portfolio.register_listener(lambda: calls.append(None))
+        eth = _FakeSource("eth", 2.0, change_h24=100.0)
+        bsc = _FakeSource("bsc", 1.0)
+
+        portfolio.async_set_position(("entry", "eth", "0xa"), eth, 10)
+        portfolio.async_set_position(("entry", "bsc", "0xb"), bsc, 5)
+        await asyncio.sleep(0)
+        # Obie pozycje dodane w jednym kroku pętli - jedno powiadomienie
+        assert calls == [None]
+        assert portfolio.value == 25.0
+        assert portfolio.network_value("eth") == 20.0
+        # 20 USD po wzroście o 100% i niezmienione 5 USD: 15 -> 25
+        assert round(portfolio.change_h24, 4) == round(10 / 15 * 100, 4)
+
+        eth.set_price(3.0)
+        assert portfolio.value == 35.0
+        assert portfolio.change_h24 == 0.0
+
+        portfolio.async_remove_position(("entry", "eth", "0xa"))
+        assert portfolio.networks == ["bsc"]
+        assert eth.listeners == []
+        portfolio.async_remove_position(("entry", "bsc", "0xb"))
+        assert portfolio.value is None
+        assert portfolio.change_h24 is None
+
+    asyncio.run(_run())
@@ -0,0 +1,115 @@
+"""Tests of the request scheduler and the circuit breaker."""
+import asyncio
+import time
+
+from custom_components.geckoterminal import scheduler as scheduler_module
+from custom_components.geckoterminal.scheduler import (
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    GeckoTerminalCircuitBreaker,
+    GeckoTerminalRequestScheduler,
+)
+
+
+class _Clock:
+    """Replacement for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _frozen_breaker(monkeypatch):
+    """Return a breaker and the clock it reads."""
+    clock = _Clock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", clock)
+    return GeckoTerminalCircuitBreaker("eth"), clock
+
+
+def _open(breaker):
+    """Record enough failures to open the circuit."""
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.async_record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures(monkeypatch):
+    breaker, _ = _frozen_breaker(monkeypatch)
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.async_record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.async_allow_request()
+
+    breaker.async_record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.async_allow_request()
+    assert breaker.open_for > 0
+
+
+def test_success_resets_failure_count(monkeypatch):
+    breaker, _ = _frozen_breaker(monkeypatch)
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.async_record_failure()
+    breaker.async_record_success()
+    breaker.async_record_failure()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_half_open_probe_closes_or_reopens(monkeypatch):
+    breaker, clock = _frozen_breaker(monkeypatch)
+    _open(breaker)
+    clock.now += breaker.open_for
+
+    assert breaker.async_allow_request()
+    assert breaker.state == BREAKER_HALF_OPEN
+    # Tylko jedno zapytanie próbne naraz
+    assert not breaker.async_allow_request()
+
+    breaker.async_record_failure()
+    assert breaker.state == BREAKER_OPEN
+    clock.now += breaker.open_for
+    assert breaker.async_allow_request()
+    breaker.async_record_success()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_released_probe_can_be_retried(monkeypatch):
+    breaker, clock = _frozen_breaker(monkeypatch)
+    _open(breaker)
+    clock.now += breaker.open_for
+    assert breaker.async_allow_request()
+
+    # Zapytanie próbne nie zostało wysłane - obwód nie może utknąć w stanie half-open
+    breaker.async_release_probe()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.async_allow_request()
+    assert breaker.state == BREAKER_HALF_OPEN
+
+
+def test_scheduler_allows_burst_then_waits():
+    async def _run():
+        scheduler = GeckoTerminalRequestScheduler(calls_per_minute=600, burst=2)
+        started = time.monotonic()
+        for _ in range(3):
+            await scheduler.async_acquire()
+        return time.monotonic() - started, scheduler.backlog
+
+    elapsed, backlog = asyncio.run(_run())
+    # Trzecie zapytanie czeka na token: 10 zapytań na sekundę
+    assert 0.05 <= elapsed < 1
+    assert backlog == 0
+
+
+def test_scheduler_defer_pauses_requests():
+    async def _run():
+        scheduler = GeckoTerminalRequestScheduler(calls_per_minute=6000, burst=5)
+        scheduler.async_defer(0.2)
+        assert scheduler.paused_for > 0
+        started = time.monotonic()
+        await scheduler.async_acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(_run()) >= 0.2
@@ -0,0 +1,92 @@
+"""Tests of the sensor platform's entry manager and sensors."""
+from dataclasses import replace
+from types import SimpleNamespace
+
+from custom_components.geckoterminal import (
+    CONF_HISTORY_BACKFILL,
+    CONF_NAME,
+    DATA_ENTRY_MANAGERS,
+    DATA_SHARED_SENSORS_OWNER,
+    DOMAIN,
+)
+from custom_components.geckoterminal import sensor as sensor_module
+from custom_components.geckoterminal.ohlcv import OHLCV_SYNC_SPREAD
+from custom_components.geckoterminal.portfolio import async_get_portfolio
+from custom_components.geckoterminal.sensor import (
+    GeckoTerminalApiSensor,
+    GeckoTerminalEntryManager,
+    GeckoTerminalPriceSensor,
+    GeckoTerminalTrackedPool,
+)
+from custom_components.geckoterminal.snapshot import PoolSnapshot
+
+
+def _manager(hass, entry_id, added):
+    """Return a registered entry manager that records the entities it adds."""
+    manager = GeckoTerminalEntryManager(
+        hass, SimpleNamespace(entry_id=entry_id), added.extend, {}
+    )
+    hass.data[DOMAIN][DATA_ENTRY_MANAGERS][entry_id] = manager
+    return manager
+
+
+def test_shared_sensors_are_handed_over_on_unload():
+    hass = SimpleNamespace(data={DOMAIN: {DATA_ENTRY_MANAGERS: {}}}, is_stopping=False)
+    first_added, second_added = [], []
+    first = _manager(hass, "first", first_added)
+    _manager(hass, "second", second_added)
+
+    first.async_add_shared_sensors()
+    assert hass.data[DOMAIN][DATA_SHARED_SENSORS_OWNER] == "first"
+    assert any(isinstance(entity, GeckoTerminalApiSensor) for entity in first_added)
+
+    first.async_unload()
+    # Sensory API przejmuje wpis, który nadal jest załadowany
+    assert hass.data[DOMAIN][DATA_SHARED_SENSORS_OWNER] == "second"
+    assert any(isinstance(entity, GeckoTerminalApiSensor) for entity in second_added)
+    # Sensory portfela dodaje już tylko nowy właściciel
+    assert len(async_get_portfolio(hass)._listeners) == 1
+
+
+def test_price_sensor_clears_attributes_without_price():
+    snapshot = PoolSnapshot.from_attributes(
+        {"base_token_price_usd": "1.25", "base_token_symbol": "TKN", "quote_token_symbol": "USDC"}, None
+    )
+    data_source = SimpleNamespace(snapshot=snapshot, stale=False, fetched_at=None)
+    sensor = GeckoTerminalPriceSensor(data_source, "entry", "Token", "eth", "0xpool", 4)
+    assert sensor.native_value == 1.25
+    assert sensor.extra_state_attributes["base_token_symbol"] == "TKN"
+
+    sensor._apply_snapshot(replace(snapshot, price_usd=None))
+    assert sensor.native_value is None
+    assert sensor.extra_state_attributes == {}
+
+
+def test_backfills_start_staggered(monkeypatch):
+    delays = []
+    cancelled = []
+
+    def _call_later(hass, delay, action):
+        delays.append(delay)
+        return lambda: cancelled.append(delay)
+
+    monkeypatch.setattr(sensor_module, "async_call_later", _call_later)
+    hass = SimpleNamespace(data={DOMAIN: {DATA_ENTRY_MANAGERS: {}}})
+    manager = GeckoTerminalEntryManager(
+        hass, SimpleNamespace(entry_id="entry"), [].extend, {CONF_HISTORY_BACKFILL: True}
+    )
+    tracked = [
+        GeckoTerminalTrackedPool(
+            {CONF_NAME: address}, SimpleNamespace(network="eth", pool_address=address), lambda: None
+        )
+        for address in ("0xaaa", "0xbbb", "0xccc")
+    ]
+    for pool in tracked:
+        manager._async_update_backfill(pool)
+
+    # Każda pula zaczyna z innym, stałym przesunięciem w obrębie okna
+    assert len(set(delays)) == 3
+    assert all(0 <= delay < OHLCV_SYNC_SPREAD for delay in delays)
+
+    tracked[0].async_stop()
+    assert cancelled == delays[:1]
@@ -0,0 +1,109 @@
+"""Tests of the streaming transport's per-pool state and reconnect loop."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.geckoterminal import stream as stream_module
+from custom_components.geckoterminal.stream import GeckoTerminalStreamTransport
+
+
+class _FakeSource:
+    """Data source recording the streaming flag and pushed data."""
+
+    def __init__(self, pool_address, network="eth"):
+        self.network = network
+        self.pool_address = pool_address
+        self.streaming = False
+        self.data = []
+
+    def async_set_streaming(self, streaming):
+        self.streaming = streaming
+
+    def async_set_data(self, attributes, base_token_address=None):
+        self.data.append(attributes)
+
+
+def _message(*addresses):
+    """Return a relay message carrying the given pools."""
+    return json.dumps({
+        "network": "eth",
+        "data": [{"attributes": {"address": address}} for address in addresses],
+    })
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    """Return a WebSocket transport on a stub Home Assistant."""
+    monkeypatch.setattr(stream_module, "async_track_time_interval", lambda *args: lambda: None)
+    monkeypatch.setattr(stream_module, "RECONNECT_MIN_DELAY", 0)
+    hass = SimpleNamespace(
+        data={},
+        async_create_background_task=lambda coro, name: asyncio.get_running_loop().create_task(coro),
+        async_create_task=lambda coro: asyncio.get_running_loop().create_task(coro),
+    )
+    return GeckoTerminalStreamTransport(hass, "ws://relay.local/stream")
+
+
+def test_only_pools_with_messages_are_streaming(stream, monkeypatch):
+    async def _run_websocket():
+        stream._async_set_connected(True)
+        stream._async_handle_message(_message("0xAA"))
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(stream, "_async_run_websocket", _run_websocket)
+
+    async def _run():
+        carried = _FakeSource("0xaa")
+        silent = _FakeSource("0xbb")
+        stream.async_add_source(carried)
+        stream.async_add_source(silent)
+        await asyncio.sleep(0)
+        assert stream.connected
+        # Pula bez danych ze strumienia jest dalej odpytywana normalnie
+        assert carried.streaming and carried.data
+        assert not silent.streaming
+
+        # Wiadomości przestały przychodzić - pula wraca do odpytywania
+        stream._last_message[("eth", "0xaa")] -= stream_module.POOL_STALE_AFTER + 1
+        stream._async_check_stale()
+        assert not carried.streaming
+
+        stream.async_remove_source(carried)
+        stream.async_remove_source(silent)
+
+    asyncio.run(_run())
+
+
+def test_unexpected_errors_reconnect_and_reset_state(stream, monkeypatch):
+    calls = []
+    source = _FakeSource("0xaa")
+
+    async def _run_websocket():
+        calls.append(None)
+        # Po błędzie poprzedniego połączenia pula wróciła do odpytywania
+        assert not stream.connected and not source.streaming
+        stream._async_set_connected(True)
+        stream._async_handle_message(_message("0xaa"))
+        if len(calls) == 1:
+            # aiohttp zgłasza błąd ramki ERROR jako zwykły Exception
+            raise Exception("WebSocket error")
+        if len(calls) == 2:
+            raise ConnectionResetError
+        stream.async_remove_source(source)
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(stream, "_async_run_websocket", _run_websocket)
+
+    async def _run():
+        stream.async_add_source(source)
+        task = stream._task
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_run())
+    assert len(calls) == 3
+    assert not stream.connected
+    assert not source.streaming
+    assert stream._task is None